@@ -0,0 +1,71 @@
+"""
+Benchmarks for the bit module.
+Run from the root of the repository, e.g.:  PYTHONPATH=. python benchmarks/bench_bit.py 100000 1000000
+"""
+import sys
+from random import randint
+from timeit import default_timer
+
+from exoticst.bit import Bit, np
+
+
+def _timed(f, *args):
+    start = default_timer()
+    f(*args)
+    return default_timer() - start
+
+
+def _build_with_add_at(lst):
+    bit = Bit(len(lst))
+    for j, x in enumerate(lst):
+        bit.add_at(j, x)
+    return bit
+
+
+def _build_with_init_with_list(lst):
+    bit = Bit(len(lst))
+    bit.init_with_list(lst)
+    return bit
+
+
+def _build_from_iterable(lst):
+    return Bit.from_iterable(iter(lst))
+
+
+def bench_construction(sizes):
+    print('%12s %12s %16s %16s' % ('n', 'add_at', 'init_with_list', 'from_iterable'))
+    for n in sizes:
+        lst = [randint(0, 1000) for _ in range(n)]
+        print('%12d %11.3fs %15.3fs %15.3fs' % (n, _timed(_build_with_add_at, lst),
+                                                _timed(_build_with_init_with_list, lst),
+                                                _timed(_build_from_iterable, lst)))
+
+
+def bench_batch_queries(sizes, n_queries=10 ** 5):
+    if np is None:
+        print('numpy is not installed, skipping the batch benchmark')
+        return
+    print('%12s %16s %20s %16s %20s' % ('n', 'prefix_sum loop', 'prefix_sum_many', 'add_at loop', 'add_at_many'))
+    for n in sizes:
+        bit = Bit.from_iterable((randint(0, 1000) for _ in range(n)), dtype='int64')
+        indices = np.random.randint(0, n, n_queries)
+        lst_indices = indices.tolist()
+
+        def _prefix_sum_loop():
+            for idx in lst_indices:
+                bit.prefix_sum(idx)
+
+        def _add_at_loop():
+            for idx in lst_indices:
+                bit.add_at(idx, 1)
+
+        print('%12d %15.3fs %19.3fs %15.3fs %19.3fs' % (n, _timed(_prefix_sum_loop),
+                                                        _timed(bit.prefix_sum_many, indices),
+                                                        _timed(_add_at_loop),
+                                                        _timed(bit.add_at_many, indices, 1)))
+
+
+if __name__ == '__main__':
+    sizes = [int(x) for x in sys.argv[1:]] or [10 ** 5, 10 ** 6, 10 ** 7]
+    bench_construction(sizes)
+    bench_batch_queries(sizes)
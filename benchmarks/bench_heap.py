@@ -0,0 +1,122 @@
+"""
+Benchmarks for the heap_with_update module.
+Run from the root of the repository, e.g.:  PYTHONPATH=. python benchmarks/bench_heap.py 10000 100000
+"""
+import sys
+from functools import partial
+from random import randint, random
+from timeit import default_timer
+
+from exoticst.dijkstra_shortest_path import DijkstraSearch, WeightedGraph
+from exoticst.heap_with_update import ArrayUpdatableHeap, UpdatableHeap
+from exoticst.pairing_heap import PairingHeap
+from exoticst.radix_heap import RadixHeap
+
+
+def _timed(f, *args):
+    start = default_timer()
+    f(*args)
+    return default_timer() - start
+
+
+def _push_decrease_pop(heap_cls, n, decreases):
+    heap = heap_cls()
+    for key in range(n):
+        heap.push(random() + 1, key, None)
+    step = 1.0 / (len(decreases) + 1)
+    for j, key in enumerate(decreases):
+        heap.decrease(1 - (j + 1) * step, key, None)  # always less than any heap key before
+    while len(heap):
+        heap.pop()
+
+
+def bench_heaps(sizes, heap_classes=(UpdatableHeap, ArrayUpdatableHeap)):
+    print('n pushes, 4*n decreases, n pops per row')
+    print('%10s' % 'n' + ''.join('%22s' % heap_cls.__name__ for heap_cls in heap_classes))
+    for n in sizes:
+        decreases = [randint(0, n - 1) for _ in range(4 * n)]
+        print('%10d' % n + ''.join('%21.3fs' % _timed(_push_decrease_pop, heap_cls, n, decreases)
+                                   for heap_cls in heap_classes))
+
+
+def bench_dense_keys(sizes):
+    print('n pushes, 4*n decreases, n pops per row; dijkstra with 20*n edges')
+    print('%10s%22s%22s%22s%22s' % ('n', 'register=dict', 'capacity=n', 'dijkstra dict', 'dijkstra capacity=n'))
+    for n in sizes:
+        decreases = [randint(0, n - 1) for _ in range(4 * n)]
+        g = _dense_graph(n, 20)
+        print('%10d%21.3fs%21.3fs%21.3fs%21.3fs' % (
+            n, _timed(_push_decrease_pop, UpdatableHeap, n, decreases),
+            _timed(_push_decrease_pop, partial(UpdatableHeap, capacity=n), n, decreases),
+            _timed(DijkstraSearch(g, heap_cls=UpdatableHeap).shortest_paths, 0),
+            _timed(DijkstraSearch(g, heap_cls=partial(UpdatableHeap, capacity=n)).shortest_paths, 0)))
+
+
+def _mix(heap, n, n_pushes, n_decreases, n_pops):
+    """
+    n_pushes pushes of the new keys, n_decreases decreases of the present keys and n_pops pops per round
+    """
+    next_key, priority = 0, float(n)
+    for _ in range(n // max(1, n_pushes)):
+        for _ in range(n_pushes):
+            heap.push(priority + random() * n, next_key, None)
+            next_key += 1
+        for _ in range(n_decreases):
+            if len(heap) > 1:
+                priority -= 1e-3
+                heap.decrease(priority, heap.heap[randint(1, len(heap) - 1)].key, None)
+        for _ in range(n_pops):
+            if len(heap):
+                heap.pop()
+
+
+def bench_arities(sizes, arities=(2, 4, 8)):
+    mixes = (('push-heavy', 8, 1, 1), ('pop-heavy', 2, 0, 2), ('decrease-heavy', 4, 40, 4))
+    print('%10s %16s' % ('n', 'mix') + ''.join('%12s' % ('arity=%d' % d) for d in arities))
+    for n in sizes:
+        for name, n_pushes, n_decreases, n_pops in mixes:
+            print('%10d %16s' % (n, name) + ''.join('%11.3fs' % _timed(_mix, UpdatableHeap(arity=d), n, n_pushes,
+                                                                       n_decreases, n_pops)
+                                                    for d in arities))
+
+
+def _dense_graph(n, degree, max_weight=None):
+    """
+    A random directed graph with n vertices and n*degree edges, the weights are decreasing with the end vertex,
+    so that most of the relaxations are successful and end with decrease();
+    with max_weight given, the weights are random integers in [0, max_weight]
+    """
+    adj_list = {v: {} for v in range(n)}
+    for v in range(n):
+        for _ in range(degree):
+            u = randint(0, n - 1)
+            if u != v:
+                adj_list[v][u] = 1 + (n - u) * random() if max_weight is None else randint(0, max_weight)
+    return WeightedGraph(list(range(n)), adj_list)
+
+
+def bench_dijkstra(sizes, degree=20, heap_classes=(UpdatableHeap, ArrayUpdatableHeap, PairingHeap)):
+    print('dijkstra, n vertices, %d*n edges per row' % degree)
+    print('%10s' % 'n' + ''.join('%22s' % heap_cls.__name__ for heap_cls in heap_classes))
+    for n in sizes:
+        g = _dense_graph(n, degree)
+        print('%10d' % n + ''.join('%21.3fs' % _timed(DijkstraSearch(g, heap_cls=heap_cls).shortest_paths, 0)
+                                   for heap_cls in heap_classes))
+
+
+def bench_dijkstra_int(sizes, degree=20, max_weight=100, heap_classes=(UpdatableHeap, PairingHeap, RadixHeap)):
+    print('dijkstra, n vertices, %d*n edges with the integer weights in [0, %d] per row' % (degree, max_weight))
+    print('%10s' % 'n' + ''.join('%22s' % heap_cls.__name__ for heap_cls in heap_classes))
+    for n in sizes:
+        g = _dense_graph(n, degree, max_weight)
+        print('%10d' % n + ''.join('%21.3fs' % _timed(DijkstraSearch(g, heap_cls=heap_cls).shortest_paths, 0)
+                                   for heap_cls in heap_classes))
+
+
+if __name__ == '__main__':
+    sizes = [int(x) for x in sys.argv[1:]] or [10 ** 4, 10 ** 5, 10 ** 6]
+    bench_heaps(sizes, heap_classes=(UpdatableHeap, ArrayUpdatableHeap, PairingHeap))
+    bench_arities(sizes)
+    bench_dense_keys(sizes)
+    bench_dijkstra(sizes)
+    bench_dijkstra_int(sizes)
@@ -0,0 +1,129 @@
+"""
+Benchmarks for the full_bin_tree_for_rmq module.
+Run from the root of the repository, e.g.:  PYTHONPATH=. python benchmarks/bench_rmq.py 10000 100000
+"""
+import operator
+import sys
+from random import randint, random
+from timeit import default_timer
+
+from exoticst.full_bin_tree_for_rmq import (ArgSegmentTree, LazySegmentTree, SegmentTree, build_helper_tree, np, rmq,
+                                          rmq_many)
+
+
+def _timed(f, *args):
+    start = default_timer()
+    f(*args)
+    return default_timer() - start
+
+
+def _random_queries(n, n_queries):
+    queries = []
+    for _ in range(n_queries):
+        i, j = randint(0, n - 1), randint(0, n - 1)
+        queries.append((min(i, j), max(i, j)))
+    return queries
+
+
+def bench_queries(sizes, n_queries=10 ** 4):
+    print('%d queries per row' % n_queries)
+    print('%10s %6s %18s %14s %12s %14s' % ('n', 'f', 'build_helper_tree', 'SegmentTree', 'rmq', 'query'))
+    for n in sizes:
+        a = [random() for _ in range(n)]
+        queries = _random_queries(n, n_queries)
+        for name, f, op, ignore in (('min', min, min, float('inf')), ('sum', sum, operator.add, 0)):
+            t = build_helper_tree(a, f=f, ignore=ignore)
+            seg = SegmentTree(a, op=op, identity=ignore)
+
+            def _rmq_loop():
+                for i, j in queries:
+                    rmq(n, t, i, j, f=f, ignore=ignore)
+
+            def _query_loop():
+                for i, j in queries:
+                    seg.query(i, j)
+
+            print('%10d %6s %17.3fs %13.3fs %11.3fs %13.3fs' % (n, name,
+                                                              _timed(build_helper_tree, a, f, ignore),
+                                                              _timed(SegmentTree, a, op, ignore),
+                                                              _timed(_rmq_loop), _timed(_query_loop)))
+
+
+def bench_range_updates(sizes, n_updates=100):
+    print('%d range additions per row' % n_updates)
+    print('%10s %22s %22s' % ('n', 'SegmentTree.update', 'LazySegmentTree'))
+    for n in sizes:
+        a = [randint(0, 1000) for _ in range(n)]
+        updates = _random_queries(n, n_updates)
+        seg = SegmentTree(a, op=operator.add, identity=0)
+        lazy = LazySegmentTree(a, f=sum)
+
+        def _point_updates():
+            for i, j in updates:
+                for k in range(i, j + 1):
+                    seg.update(k, 5)
+
+        def _lazy_updates():
+            for i, j in updates:
+                lazy.add_range(i, j, 5)
+
+        print('%10d %21.3fs %21.3fs' % (n, _timed(_point_updates), _timed(_lazy_updates)))
+
+
+def _tuple_argmin(lst):
+    i, mn = lst[0]
+    for j, x in lst:
+        if x < mn:
+            i, mn = j, x
+    return i, mn
+
+
+def bench_argmin(sizes, n_queries=10 ** 4):
+    print('%d argmin queries per row' % n_queries)
+    print('%10s %26s %26s' % ('n', 'rmq with (index, value)', 'ArgSegmentTree'))
+    ign = (0, float('inf'))
+    for n in sizes:
+        a = [random() for _ in range(n)]
+        queries = _random_queries(n, n_queries)
+        t = build_helper_tree(list(enumerate(a)), f=_tuple_argmin, ignore=ign)
+        arg_t = ArgSegmentTree(a)
+
+        def _rmq_loop():
+            for i, j in queries:
+                rmq(n, t, i, j, f=_tuple_argmin, ignore=ign)
+
+        def _arg_query_loop():
+            for i, j in queries:
+                arg_t.arg_query(i, j)
+
+        print('%10d %25.3fs %25.3fs' % (n, _timed(_rmq_loop), _timed(_arg_query_loop)))
+
+
+def bench_batch_queries(sizes, n_queries=10 ** 6):
+    if np is None:
+        print('numpy is not installed, skipping the batch benchmark')
+        return
+    print('%d queries per row, throughput in queries per second' % n_queries)
+    print('%10s %6s %16s %16s' % ('n', 'f', 'query loop', 'rmq_many'))
+    for n in sizes:
+        a = [random() for _ in range(n)]
+        starts = np.random.randint(0, n, n_queries)
+        ends = np.minimum(starts + np.random.randint(0, n, n_queries), n - 1)
+        lst_queries = list(zip(starts.tolist(), ends.tolist()))
+        for name, op, identity in (('min', min, float('inf')), ('sum', operator.add, 0)):
+            seg = SegmentTree(a, op=op, identity=identity)
+
+            def _query_loop():
+                for i, j in lst_queries:
+                    seg.query(i, j)
+
+            print('%10d %6s %16d %16d' % (n, name, n_queries / _timed(_query_loop),
+                                          n_queries / _timed(rmq_many, seg, starts, ends)))
+
+
+if __name__ == '__main__':
+    sizes = [int(x) for x in sys.argv[1:]] or [10 ** 4, 10 ** 5, 10 ** 6]
+    bench_queries(sizes)
+    bench_range_updates(sizes)
+    bench_argmin(sizes)
+    bench_batch_queries(sizes)
@@ -8,8 +8,9 @@ which takes O(n) time, while the change of the element itself takes O(1) time, O
 BIT structure takes O(log(n)) time to calculate a prefix sum, and O(log(n)) to update the structure on element change,
 the same space complexity.
 
-Initiation of the structure requires O(n*log(n)) time. This means that in case when the underlying array elements
-are not going to be changed, or the number of such changes much smaller than log(n), brute force method would be faster.
+Initiation of the structure requires O(n) time: every node of the tree passes its range sum to its parent exactly once.
+This means that in case when the underlying array elements are not going to be changed, or the number of such changes
+is small, brute force method would be faster.
 
 References:
 https://www.youtube.com/watch?v=v_wj_mOAlig&t=1s
@@ -18,13 +19,59 @@ https://cs.stackexchange.com/questions/10538/bit-what-is-the-intuition-behind-a-
 Also see full_bin_tree_for_rmq module in this library.  It uses a very similar structure with slightly different
 implementation of the construction and the search.   In addition to the range sum, the range max/min queries are
 implemented there as well, with the usage described in the documentation.
+
+Optionally, the tree can be kept in a NumPy array instead of a Python list, e.g., Bit(n, dtype='int64').
+Then, besides the usual methods, the batch methods prefix_sum_many(), range_sum_many() and add_at_many() process
+the whole batch of indexes per level of the tree, i.e., with O(log(n)) vectorized NumPy operations.
+
+RangeBit keeps two Bit trees to support adding a value to a whole range of elements, as well as range sums,
+in O(log(n)) time each.
+
+Bit2D is a two-dimensional version of the tree for the prefix sums and the rectangle sums of a grid,
+O(log(rows)*log(cols)) time per update or query.
+
+For huge key spaces, e.g., 64-bit timestamps, SparseBit keeps only the nodes on the touched update paths in a dict,
+O(log(U)) time per operation for the universe of U keys, with the memory proportional to the number of updates.
+When the set of the keys is known in advance, CompressedBit maps the keys into a dense Bit of the size of the set.
+
+A NumPy-backed Bit can also live in a memory-mapped file, see Bit.create_mmap() and Bit.open_mmap():
+a restarted process, or several reader processes, reuse the same tree without parsing or copying it.
+The file starts with a fixed-size header (magic, version, dtype, length) followed by the tree itself.
 """
 
+import struct
+from bisect import bisect_left, bisect_right
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, it is required only for the array-backed storage
+    np = None
+
 
 class BITError(Exception):
     pass
 
 
+MMAP_MAGIC = b'EXBITREE'
+MMAP_VERSION = 1
+_MMAP_HEADER = struct.Struct('<8sI12sQ')  # magic, version, dtype (e.g., '<i8'), n, i.e., the length of the array
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('numpy is required for the array-backed storage')
+
+
+def _zeros(size, dtype):
+    """
+    :return:    the storage for a tree: a list of zeros if dtype is None, otherwise a NumPy array of zeros
+    """
+    if dtype is None:
+        return [0] * size
+    _require_numpy()
+    return np.zeros(size, dtype=dtype)
+
+
 class Bit(object):
     """
     Implementation of Binary Index Tree AKA Fenwick Tree.
@@ -37,28 +84,151 @@ class Bit(object):
     of an array requires to update O(log(n)) range sums, i.e., takes O(log(n)) time.
     """
 
-    def __init__(self, n):
+    def __init__(self, n, dtype=None):
         """
         Moved initialisation into init_with_list() method for convenience.
         Don't forget to always use init_with_list() method first.
+        :param n:       the length of the original array
+        :param dtype:   None to keep the tree in a Python list, or a NumPy dtype, e.g., 'int64' or 'float64',
+                        to keep it in a NumPy array
         """
         if n < 1:
             raise BITError('Illegal input length')
-        self.tree_lst = [0] * (n + 1)
+        self.dtype = dtype
+        self.tree_lst = _zeros(n + 1, dtype)
 
-    def init_with_list(self, lst):
+    @staticmethod
+    def _build_array(tree_arr):
         """
+        Vectorized version of the linear time construction for the NumPy storage:
+        the nodes with the same last set bit (step) have distinct parents, and they are complete once all
+        the nodes with the smaller last set bits have been added to their parents.
+        The construction works along the first axis of tree_arr, so it is also used by Bit2D for its rows and,
+        via the transposed view, for its columns.
+        """
+        n = len(tree_arr) - 1
+        step = 1
+        while step <= n:
+            bit_idx = np.arange(step, n + 1 - step, 2 * step)
+            tree_arr[bit_idx + step] += tree_arr[bit_idx]
+            step <<= 1
 
-        This implementation requires O(n*lg(n))  operations.
+    def init_with_list(self, lst):
+        """
+        Linear time initialisation: the elements are copied into the tree, then each node adds its range sum to
+        its parent, i.e., to the node at bit_idx + (bit_idx & -bit_idx).
+        This implementation requires O(n)  operations.
         :param lst: the list to initialize the tree with
         :return:
         """
         n = len(lst)
         if n < 1:
             raise BITError('Illegal input length')
-        self.tree_lst = [0] * (n + 1)
-        for j, x in enumerate(lst):
-            self.add_at(j, x)
+        if self.dtype is not None:
+            if isinstance(self.tree_lst, np.memmap):
+                if len(self.tree_lst) != n + 1:
+                    raise BITError('The memory-mapped tree has a fixed length n=%d' % (len(self.tree_lst) - 1))
+                tree_arr = self.tree_lst  # write through to the mapping
+                tree_arr[0] = 0
+            else:
+                tree_arr = _zeros(n + 1, self.dtype)
+            tree_arr[1:] = lst
+            self._build_array(tree_arr)
+            self.tree_lst = tree_arr
+            return
+        tree_lst = [0] * (n + 1)
+        tree_lst[1:] = lst
+        for bit_idx in range(1, n + 1):
+            parent_idx = bit_idx + (bit_idx & -bit_idx)
+            if parent_idx <= n:
+                tree_lst[parent_idx] += tree_lst[bit_idx]
+        self.tree_lst = tree_lst
+
+    @classmethod
+    def from_iterable(cls, iterable, dtype=None):
+        """
+        Build the tree from an iterable (e.g., a generator) without materialising the input as a list first.
+        When an element arrives at BIT index bit_idx, all the nodes inside its range, i.e., its children
+        bit_idx - 1, bit_idx - 1 - ((bit_idx - 1) & -(bit_idx - 1)), ... are already complete, so the node is
+        finalised in place.  Every node is added to its parent exactly once, so it takes O(n) operations overall.
+        :param iterable:    the elements of the original array in order
+        :param dtype:       see __init__()
+        :return:            a new Bit object
+        """
+        bit = cls.__new__(cls)
+        bit.dtype = dtype
+        if dtype is not None:
+            _require_numpy()
+            tree_arr = np.concatenate((np.zeros(1, dtype=dtype), np.fromiter(iterable, dtype=dtype)))
+            if len(tree_arr) < 2:
+                raise BITError('Illegal input length')
+            cls._build_array(tree_arr)
+            bit.tree_lst = tree_arr
+            return bit
+        tree_lst = [0]
+        for x in iterable:
+            bit_idx = len(tree_lst)
+            low = bit_idx - (bit_idx & -bit_idx)
+            chld_idx = bit_idx - 1
+            while chld_idx > low:
+                x += tree_lst[chld_idx]
+                chld_idx -= (chld_idx & -chld_idx)
+            tree_lst.append(x)
+        if len(tree_lst) < 2:
+            raise BITError('Illegal input length')
+        bit.tree_lst = tree_lst
+        return bit
+
+    @classmethod
+    def create_mmap(cls, path, n, dtype='int64'):
+        """
+        Create a file of the fixed size for the tree of length n, all the elements are 0, and map it read-write.
+        Use init_with_list() or add_at() to fill it in, the changes are written through to the mapping.
+        :param path:    the path of the file to create (an existing file is overwritten)
+        :param n:       the length of the original array
+        :param dtype:   a NumPy dtype with fixed width, e.g., 'int64' or 'float64'
+        :return:        a new Bit object backed by the file
+        """
+        if n < 1:
+            raise BITError('Illegal input length')
+        _require_numpy()
+        dtype = np.dtype(dtype)
+        with open(path, 'wb') as fh:
+            fh.write(_MMAP_HEADER.pack(MMAP_MAGIC, MMAP_VERSION, dtype.str.encode('ascii'), n))
+            fh.truncate(_MMAP_HEADER.size + (n + 1) * dtype.itemsize)
+        return cls.open_mmap(path, writable=True)
+
+    @classmethod
+    def open_mmap(cls, path, writable=False):
+        """
+        Map the tree kept in a file created by create_mmap(), without reading or copying it.
+        :param path:        the path of the file
+        :param writable:    False to map the file read-only, True to map it read-write
+        :return:            a new Bit object backed by the file
+        """
+        _require_numpy()
+        with open(path, 'rb') as fh:
+            header = fh.read(_MMAP_HEADER.size)
+        if len(header) < _MMAP_HEADER.size:
+            raise BITError('%s is not a Bit file' % path)
+        magic, version, dtype, n = _MMAP_HEADER.unpack(header)
+        if magic != MMAP_MAGIC:
+            raise BITError('%s is not a Bit file' % path)
+        if version > MMAP_VERSION:
+            raise BITError('Unsupported version %d of the Bit file %s' % (version, path))
+        dtype = np.dtype(dtype.rstrip(b'\0').decode('ascii'))
+        bit = cls.__new__(cls)
+        bit.dtype = dtype.str
+        bit.tree_lst = np.memmap(path, dtype=dtype, mode='r+' if writable else 'r',
+                                 offset=_MMAP_HEADER.size, shape=(n + 1,))
+        return bit
+
+    def flush(self):
+        """
+        Write the changes of a memory-mapped tree to the file; does nothing for the other storages
+        """
+        if np is not None and isinstance(self.tree_lst, np.memmap):
+            self.tree_lst.flush()
 
     def add_at(self, idx, increment):
         """
@@ -104,6 +274,373 @@ class Bit(object):
         """
         return self.prefix_sum(j) - self.prefix_sum(j - 1)
 
+    def lower_bound(self, target_sum):
+        """
+        Find the smallest original index idx such that prefix_sum(idx) >= target_sum.
+        *Requires* all the elements to be non-negative, i.e., the prefix sums to be non-decreasing.
+        Binary lifting: a single descent over tree_lst from the largest power of 2 not exceeding n,
+        O(lg(n))  operations required
+        :param target_sum:  the prefix sum to reach
+        :return:            the original index, or n if the total sum of the elements is less than target_sum
+        """
+        n = len(self.tree_lst) - 1
+        pos, rem = 0, target_sum
+        step = 1 << (n.bit_length() - 1)
+        while step:
+            nxt = pos + step
+            if nxt <= n and self.tree_lst[nxt] < rem:
+                pos = nxt
+                rem -= self.tree_lst[nxt]
+            step >>= 1
+        return pos  # BIT index pos + 1 is the answer, i.e., original index pos
+
+    def find_kth(self, k):
+        """
+        When the elements are the counts (frequencies) of the items with the correspondent indexes, find the index of
+        the k-th smallest item, k = 1, 2, ..., total count.
+        *Requires* all the elements to be non-negative.  O(lg(n))  operations required
+        :param k:   the rank of the item, starting from 1
+        :return:    the original index of the k-th item
+        """
+        idx = self.lower_bound(k)
+        if k < 1 or idx == len(self.tree_lst) - 1:
+            raise BITError('k=%r is out of range' % (k,))
+        return idx
+
+    def prefix_sum_many(self, indices):
+        """
+        Batch version of prefix_sum(), O(lg(n)) vectorized operations for the NumPy storage.
+        The 0th element of the tree is always 0, so the indexes that already reached it do not need to be masked out.
+        :param indices: a sequence (or a NumPy array) of original indexes
+        :return:        a NumPy array (a list for the list storage) of the correspondent prefix sums
+        """
+        if self.dtype is None:
+            return [self.prefix_sum(idx) for idx in indices]
+        bit_idx = np.asarray(indices, dtype=np.int64) + 1
+        pr_sums = np.zeros(len(bit_idx), dtype=self.tree_lst.dtype)
+        while bit_idx.any():
+            pr_sums += self.tree_lst[bit_idx]
+            bit_idx -= (bit_idx & -bit_idx)
+        return pr_sums
+
+    def range_sum_many(self, starts, ends):
+        """
+        Batch version of range_sum()
+        :param starts:  a sequence (or a NumPy array) of the beginning indexes of the segments
+        :param ends:    a sequence (or a NumPy array) of the last indexes of the segments
+        :return:        a NumPy array (a list for the list storage) of the sums of the segments
+        """
+        if self.dtype is None:
+            return [self.range_sum(i, j) for i, j in zip(starts, ends)]
+        return self.prefix_sum_many(ends) - self.prefix_sum_many(np.asarray(starts, dtype=np.int64) - 1)
+
+    def add_at_many(self, indices, increments):
+        """
+        Batch version of add_at(), O(lg(n)) vectorized operations for the NumPy storage.
+        Repeated indexes are allowed, their increments are accumulated.
+        :param indices:     a sequence (or a NumPy array) of original indexes of the elements to increment
+        :param increments:  a sequence (or a NumPy array) of the values to increment, or a single value for all
+        :return:            updates the tree in place, returns None
+        """
+        if self.dtype is None:
+            if not hasattr(increments, '__len__'):
+                increments = [increments] * len(indices)
+            for idx, increment in zip(indices, increments):
+                self.add_at(idx, increment)
+            return
+        bit_idx = np.asarray(indices, dtype=np.int64) + 1
+        increments = np.broadcast_to(np.asarray(increments, dtype=self.tree_lst.dtype), bit_idx.shape)
+        n = len(self.tree_lst) - 1
+        while len(bit_idx):
+            np.add.at(self.tree_lst, bit_idx, increments)
+            bit_idx = bit_idx + (bit_idx & -bit_idx)
+            inside = bit_idx <= n
+            bit_idx, increments = bit_idx[inside], increments[inside]
+
+
+class RangeBit(object):
+    """
+    Range update / range query Fenwick tree built from two Bit trees b1 and b2.
+    Adding delta to the elements in [i, j] is recorded as the point updates
+        b1: +delta at i, -delta at j+1
+        b2: +delta*i at i, -delta*(j+1) at j+1
+    so that the prefix sum up to and including idx is b1.prefix_sum(idx) * (idx + 1) - b2.prefix_sum(idx).
+    Both the range update and the range sum take O(log(n)) time.
+    """
+
+    def __init__(self, n, dtype=None):
+        """
+        :param n:       the length of the original array, all the elements are 0 initially
+        :param dtype:   see Bit.__init__()
+        """
+        self.n = n
+        self.b1 = Bit(n, dtype=dtype)
+        self.b2 = Bit(n, dtype=dtype)
+
+    def init_with_list(self, lst):
+        """
+        The initial elements go into b2 with the negative sign, O(n) operations required
+        :param lst: the list to initialize the tree with
+        """
+        n = len(lst)
+        if n < 1:
+            raise BITError('Illegal input length')
+        self.n = n
+        self.b1 = Bit(n, dtype=self.b1.dtype)
+        self.b2.init_with_list([-x for x in lst])
+
+    def add_range(self, i, j, delta):
+        """
+        Add delta to every element with the index between and including i and j, O(lg(n)) operations required
+        :param i:       the beginning index of the segment of elements to increment
+        :param j:       the last index of the segment of elements to increment
+        :param delta:   the value to increment
+        :return:        updates the trees in place, returns None
+        """
+        if not (0 <= i <= j < self.n):
+            raise BITError('Invalid range arguments')
+        self.b1.add_at(i, delta)
+        self.b1.add_at(j + 1, -delta)
+        self.b2.add_at(i, delta * i)
+        self.b2.add_at(j + 1, -delta * (j + 1))
+
+    def add_at(self, idx, increment):
+        """
+        Increment a single element, the same as add_range(idx, idx, increment)
+        """
+        self.add_range(idx, idx, increment)
+
+    def prefix_sum(self, idx):
+        """
+        O(lg(n))  operations required
+        :param idx: original index to calculate cumulative sum up to and including it
+        :return:    the prefix sum
+        """
+        return self.b1.prefix_sum(idx) * (idx + 1) - self.b2.prefix_sum(idx)
+
+    def range_sum(self, i, j):
+        """
+        Cumulative sum of the elements between and including to the indexes i and j, O(lg(n)) operations required
+        """
+        return self.prefix_sum(j) - self.prefix_sum(i - 1)
+
+    def element(self, j):
+        """
+        Find and return the value of the element at original index j
+        """
+        return self.prefix_sum(j) - self.prefix_sum(j - 1)
+
+
+class Bit2D(object):
+    """
+    Two-dimensional Binary Indexed Tree: the BIT over the rows, where every node is a BIT over the columns.
+    The (rows+1) x (cols+1) tree is kept in a single flat list (or a NumPy array), the node (r, c) is at r*(cols+1)+c.
+    Updates, prefix sums and rectangle sums take O(log(rows)*log(cols)) time.
+    """
+
+    def __init__(self, rows, cols, dtype=None):
+        """
+        :param rows:    the number of rows of the original grid
+        :param cols:    the number of columns of the original grid
+        :param dtype:   see Bit.__init__()
+        """
+        if rows < 1 or cols < 1:
+            raise BITError('Illegal input shape')
+        self.rows, self.cols = rows, cols
+        self.dtype = dtype
+        self.tree_lst = _zeros((rows + 1) * (cols + 1), dtype)
+
+    def init_with_list(self, grid):
+        """
+        Linear time initialisation with a 2D array: every row is built as a 1D BIT, then every row of the tree
+        is added to its parent row, O(rows*cols) operations required.
+        :param grid:    a list of lists (or a 2D NumPy array) of rows*cols elements
+        """
+        rows = len(grid)
+        cols = len(grid[0]) if rows else 0
+        if rows < 1 or cols < 1:
+            raise BITError('Illegal input shape')
+        self.rows, self.cols = rows, cols
+        width = cols + 1
+        tree_lst = _zeros((rows + 1) * width, self.dtype)
+        if self.dtype is not None:
+            tree_arr = tree_lst.reshape(rows + 1, width)
+            tree_arr[1:, 1:] = grid
+            Bit._build_array(tree_arr)
+            Bit._build_array(tree_arr.T)
+            self.tree_lst = tree_lst
+            return
+        for r in range(1, rows + 1):
+            row = grid[r - 1]
+            if len(row) != cols:
+                raise BITError('Illegal input shape')
+            base = r * width
+            tree_lst[base + 1:base + width] = row
+            for c in range(1, cols + 1):
+                parent_c = c + (c & -c)
+                if parent_c <= cols:
+                    tree_lst[base + parent_c] += tree_lst[base + c]
+        for r in range(1, rows + 1):
+            parent_r = r + (r & -r)
+            if parent_r <= rows:
+                base, parent_base = r * width, parent_r * width
+                for c in range(1, cols + 1):
+                    tree_lst[parent_base + c] += tree_lst[base + c]
+        self.tree_lst = tree_lst
+
+    def add_at(self, r, c, increment):
+        """
+        Increment the element at original indexes (r, c), O(lg(rows)*lg(cols))  operations required
+        """
+        width = self.cols + 1
+        bit_r = r + 1
+        while bit_r <= self.rows:
+            base = bit_r * width
+            bit_c = c + 1
+            while bit_c < width:
+                self.tree_lst[base + bit_c] += increment
+                bit_c += (bit_c & -bit_c)
+            bit_r += (bit_r & -bit_r)
+
+    def prefix_sum(self, r, c):
+        """
+        O(lg(rows)*lg(cols))  operations required
+        :return:    the sum of the elements with the indexes (i, j), 0 <= i <= r, 0 <= j <= c
+        """
+        width = self.cols + 1
+        pr_sum = 0
+        bit_r = r + 1
+        while bit_r > 0:
+            base = bit_r * width
+            bit_c = c + 1
+            while bit_c > 0:
+                pr_sum += self.tree_lst[base + bit_c]
+                bit_c -= (bit_c & -bit_c)
+            bit_r -= (bit_r & -bit_r)
+        return pr_sum
+
+    def rect_sum(self, r1, c1, r2, c2):
+        """
+        Sum of the elements of the rectangle with the corners (r1, c1) and (r2, c2) including the borders
+        """
+        return (self.prefix_sum(r2, c2) - self.prefix_sum(r1 - 1, c2)
+                - self.prefix_sum(r2, c1 - 1) + self.prefix_sum(r1 - 1, c1 - 1))
+
+    def element(self, r, c):
+        """
+        Find and return the value of the element at original indexes (r, c)
+        """
+        return self.rect_sum(r, c, r, c)
+
+
+class SparseBit(object):
+    """
+    Binary Indexed Tree over the keys in range(universe) with the nodes allocated on demand:
+    the tree is a dict from the BIT index to the range sum, only the nodes along the update paths are present.
+    An update or a prefix sum takes O(log(universe)) time, an update adds at most log(universe) nodes.
+    """
+
+    def __init__(self, universe):
+        """
+        :param universe:    the number of the possible keys, i.e., the keys are in range(universe), e.g., 2**64
+        """
+        if universe < 1:
+            raise BITError('Illegal universe size')
+        self.universe = universe
+        self.tree = {}
+
+    def add_at(self, key, increment):
+        """
+        Increment element at key, O(lg(universe))  operations required
+        """
+        if not (0 <= key < self.universe):
+            raise BITError('key=%r is out of the universe' % (key,))
+        tree = self.tree
+        bit_idx = key + 1
+        while bit_idx <= self.universe:
+            tree[bit_idx] = tree.get(bit_idx, 0) + increment
+            bit_idx += (bit_idx & -bit_idx)
+
+    def prefix_sum(self, key):
+        """
+        O(lg(universe))  operations required
+        :return:    the sum of the elements with the keys up to and including key
+        """
+        tree = self.tree
+        bit_idx = min(key + 1, self.universe)
+        pr_sum = 0
+        while bit_idx > 0:
+            pr_sum += tree.get(bit_idx, 0)
+            bit_idx -= (bit_idx & -bit_idx)
+        return pr_sum
+
+    def range_sum(self, i, j):
+        """
+        Cumulative sum of the elements with the keys between and including i and j
+        """
+        return self.prefix_sum(j) - self.prefix_sum(i - 1)
+
+    def element(self, key):
+        """
+        Find and return the value of the element at key
+        """
+        return self.prefix_sum(key) - self.prefix_sum(key - 1)
+
+
+class CompressedBit(object):
+    """
+    Offline coordinate compression: the known set of the keys is sorted and the i-th smallest key is mapped
+    into the index i of a dense Bit, so the size of the tree is the number of the distinct keys.
+    Updates take O(log(n)) time, the prefix sums can be queried at any key, not only at the known ones.
+    """
+
+    def __init__(self, keys, values=None, dtype=None):
+        """
+        O(n*log(n)) operations required for sorting the keys, the tree itself is built in O(n)
+        :param keys:    an iterable of the keys, duplicates are allowed
+        :param values:  None for all zero elements, or a dict from a key into its initial value
+        :param dtype:   see Bit.__init__()
+        """
+        self.keys = sorted(set(keys))
+        if not self.keys:
+            raise BITError('Illegal input length')
+        self.bit = Bit(len(self.keys), dtype=dtype)
+        if values is not None:
+            self.bit.init_with_list([values.get(key, 0) for key in self.keys])
+
+    def index(self, key):
+        """
+        :return:    the index of the key in the dense Bit
+        """
+        idx = bisect_left(self.keys, key)
+        if idx == len(self.keys) or self.keys[idx] != key:
+            raise BITError('key=%r is not among the compressed keys' % (key,))
+        return idx
+
+    def add_at(self, key, increment):
+        """
+        Increment element at key, which has to be one of the compressed keys, O(lg(n))  operations required
+        """
+        self.bit.add_at(self.index(key), increment)
+
+    def prefix_sum(self, key):
+        """
+        :return:    the sum of the elements with the keys up to and including key, which can be any key
+        """
+        return self.bit.prefix_sum(bisect_right(self.keys, key) - 1)
+
+    def range_sum(self, i, j):
+        """
+        Cumulative sum of the elements with the keys between and including i and j
+        """
+        return self.bit.prefix_sum(bisect_right(self.keys, j) - 1) - self.bit.prefix_sum(bisect_left(self.keys, i) - 1)
+
+    def element(self, key):
+        """
+        Find and return the value of the element at key, which has to be one of the compressed keys
+        """
+        return self.bit.element(self.index(key))
+
 
 if __name__ == "__main__":
     """
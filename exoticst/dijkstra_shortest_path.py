@@ -6,11 +6,22 @@ it uses the UpdatableHeap implementation of the heap, which updates (decreases)
 of an internal element in logarithmic time, instead of sorting the whole heap each time
 (e.g., as the implementation from the standard Python library heapq does)
 The time complexity is O((E + V)log(V) where E and V are the numbers of edges and vertices respectively.
+
+Any heap with the same interface can be used instead of UpdatableHeap, e.g., DijkstraSearch(g, heap_cls=PairingHeap)
+from pairing_heap module, with O(1) amortized decrease(), which gives O(E + V*log(V)) amortized time.
+With heap_cls='auto', when all the weights are integers in [0, INT_WEIGHT_BOUND), RadixHeap from radix_heap module
+is picked, which takes O(E + V*log(C)) time, where C is the maximal weight; otherwise UpdatableHeap is used.
+RadixHeap settles the vertices at equal distances in an arbitrary order, and init_q() cannot be used with it.
+For the vertices 0, 1, ..., n-1, heap_cls=functools.partial(UpdatableHeap, capacity=n) keeps the positions of
+the vertices in the heap in a list instead of a dict.
 """
 
 from exoticst.heap_with_update import HeapElement, UpdatableHeap
+from exoticst.radix_heap import RadixHeap
 from collections import defaultdict
 
+INT_WEIGHT_BOUND = 2 ** 32
+
 
 class WeightedGraph(object):
     """
@@ -29,14 +40,19 @@ class DijkstraSearch(object):
     asymptotically more efficient than the heapq implementation from the standard Python library
     """
 
-    def __init__(self, g):
+    def __init__(self, g, heap_cls=UpdatableHeap):
         """
         :param g: WeightedGraph object, where its adj_list *assume* to be a dict, with the vertices as keys and
                   the dictionaries {vertex, weight) as items, i.e., graph.adj_list[vertex1][vertex2] is
                   a weight of the edge between vertex1 and vertex2
+        :param heap_cls: the class of the priority queue with push(), pop(), decrease() and len(),
+                  e.g., UpdatableHeap, ArrayUpdatableHeap or PairingHeap;
+                  'auto' to pick RadixHeap if all the weights are small integers, see has_small_int_weights()
         """
         self.g = g
-        self.queue = UpdatableHeap()
+        if heap_cls == 'auto':
+            heap_cls = RadixHeap if has_small_int_weights(g) else UpdatableHeap
+        self.queue = heap_cls()
         self.prev = set()
         self.vds = {}
 
@@ -109,6 +125,15 @@ class DijkstraSearch(object):
 
 ######################################################################################
 
+def has_small_int_weights(g, bound=INT_WEIGHT_BOUND):
+    """
+    :param g:       WeightedGraph object
+    :param bound:   the exclusive upper bound of the weights
+    :return:        True if all the weights in g.adj_list are integers in [0, bound), i.e., RadixHeap can be used
+    """
+    return all(isinstance(w, int) and 0 <= w < bound for adj in g.adj_list.values() for w in adj.values())
+
+
 def make_undirected_weighted_graph(edges):
     """
     A convenience function, which if needed, converts a graph to undirected graph,
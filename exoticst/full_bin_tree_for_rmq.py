@@ -6,7 +6,9 @@ The construction takes O(n) time with O(n) an additional space for the array wit
 The update of the range query tree in O(log(n)) time with O(1) additional space (works for max/min as well as for sum)
 
 Here the Range Queries take O(log(n)) time, which is not optimal but often good enough, while the
-known (at least to me) structure that gives O(1) time is much more complicated than this one.
+known (at least to me) structure that gives O(1) time with O(n) space is much more complicated than this one.
+For the arrays that never change, see the SparseTable in sparse_table module of this library:
+O(1) range min/max queries after O(n*log(n)) construction.
 
 The full bin tree we are constructing here is kept in an array (a Python list) in a similar way to the heap structure.
 The 0th element corresponds to the root, the indexes of the two children of a node at i are 2*i+1 and 2*i+2, while
@@ -39,6 +41,11 @@ new_t = update(len(a), t, idx_change=j, change=ch, f=max, ignore=-float('inf))
 To update the prebuilt range query tree t for sum, where the new value of a at index j is new_value:
 new_t = update(len(a), t, idx_change=j, change=(new_value-a[j]), f=sum, ignore=0)
 
+Note that update() can only move the min down (the max up): raising a minimum or lowering a maximum leaves stale
+values in the ancestors.  set_value() assigns the new value to the element and recomputes all its ancestors
+bottom-up, which works for any associative f in O(log(n)) time, so it is the primary way to update the tree:
+new_t = set_value(len(a), t, idx_change=j, value=new_value, f=f, ignore=ign)
+
 It is also possible to prepare and perform the Range Minimum/Maximum Queries in the second definition of the RMQ,
 i.e., to search for the indexes of the max/min in the given ranges, with the same times/space characteristics.
 For the examples, see test_range_indexes_min_query() and test_range_indexes_max_query() below.
@@ -68,9 +75,56 @@ and use the same calls:
 t = build_helper_tree(b, f=f, ignore=ign)
 rmq(len(a), t, i, j, f=f, ignore=ign)[0]    # the function returns tuple in the form (index, max_value)
 
+The ArgSegmentTree class below does the same several times faster and with less memory: it keeps only the indexes
+in a compact integer array and compares the elements of a at these indexes, the ties go to the leftmost index:
+t = ArgSegmentTree(a)           # or ArgSegmentTree(a, f=max)
+t.arg_query(i, j)               # the index of the min (max) element in the range [i, j]
+t.set_value(j, x)               # a[j] = x in O(log(n)) time
+
+The functions above are kept for compatibility.  The SegmentTree class below is the faster engine for the same
+queries: it keeps the tree of exactly 2*n elements, builds and queries it iteratively (bottom-up), and calls
+a *binary* combine function, e.g., min, max or operator.add, with two arguments, so no list is allocated per node
+and there is no recursion at all.  The leaves are at the indexes n..2*n-1, the children of a node k are 2*k and 2*k+1.
+
+t = SegmentTree(a)                                    # range minimum
+t = SegmentTree(a, op=max, identity=-float('inf'))   # range maximum
+t = SegmentTree(a, op=operator.add, identity=0)      # range sum
+t.query(i, j)                                         # op of the elements with the indexes in [i, j]
+t.set_value(j, x)                                     # a[j] = x for any op, see set_value() below
+t.update(j, ch)                                       # the same semantics as update() below
+
+To save memory on large arrays, SegmentTree can keep the tree in a contiguous typed buffer instead of a list:
+t = SegmentTree(a, typecode='d')                     # array('d'), 8 bytes per node, exactly 2*n nodes
+t = SegmentTree(a, op=operator.add, identity=0, dtype='int64')   # a NumPy array, built with vectorized operations
+Any object supporting the buffer protocol (array, memoryview, NumPy array) of the same type is copied into
+the tree directly, without making a list out of it first.
+
+The descent queries walk the tree once in O(log(n)) time instead of binary searching over the range queries:
+t.find_first(i, lambda v: v < x)      # the first index >= i with a[index] < x, for the min tree
+t.find_last(j, lambda v: v < x)       # the last index <= j with a[index] < x, for the min tree
+t.max_right(0, lambda s: s < k)       # the first index where the prefix sum reaches k, for the sum tree
+t.min_left(j, lambda s: s < k)        # the symmetric search to the left of j
+
+rmq_many(t, starts, ends) answers a whole batch of the queries to a SegmentTree at once; with NumPy installed and
+op being min, max or operator.add, the bottom-up walk is vectorized over all the queries, level by level.
+
+LazySegmentTree supports the range updates in O(log(n)) time with lazy propagation: adding a value to all
+the elements in [i, j], or assigning a value to all of them, combined with the min, max or sum queries:
+t = LazySegmentTree(a, f=sum)
+t.add_range(i, j, 5)
+t.assign_range(i, j, 0)
+t.query(i, j)
 """
+import operator
+import sys
+from array import array
 from math import ceil, log2
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, it is required only for the vectorized batch queries
+    np = None
+
 
 def build_helper_tree(a, f=min, ignore=float('inf')):
     """
@@ -93,6 +147,8 @@ def build_helper_tree(a, f=min, ignore=float('inf')):
         return t[idx]
 
     n = len(a)
+    if n == 0:
+        return []
     d = 2 ** (int(ceil(log2(n))))  # int was needed in older versions of Python
     m = 2 * d - 1  # n leaves => n - 1 internal nodes;  tree height = int(ceil(log2(n))
     fbt = [ignore for j in range(m)]
@@ -157,6 +213,573 @@ def update(len_a, t, idx_change, change, f=min, ignore=float('inf')):
     return t
 
 
+def set_value(len_a, t, idx_change, value, f=min, ignore=float('inf')):
+    """
+    Given an index in the original array a and the new value of the element at this index, update the
+    full binary tree to be used for Range Queries: descend to the leaf, then recompute its ancestors bottom-up.
+    Unlike update(), it works for any associative f and any direction of the change, in O(log(n)) time.
+    :param len_a:       the length of the original array
+    :param t:           the full binary tree for RMQ, has to be prepared before calling this function
+    :param idx_change:  the index in a where the element is being updated
+    :param value:       the new value of a[idx_change]
+    :param f:           min or max (or "similar") function
+    :param ignore:      e.g., it is float('inf') if f==min else -float('inf') if f==max else 0 #if f==sum
+    :return:  the full binary tree updated with the new value at a given index, to be used for RQs of a
+    """
+    if not (0 <= idx_change <= len_a - 1):
+        raise IndexError("idx_change=%d is out of bounds" % idx_change)
+    path = []
+    idx = 0
+    s, e = 0, len_a - 1
+    while s < e:
+        path.append(idx)
+        mid = s + (e - s) // 2
+        if idx_change <= mid:
+            e = mid
+            idx = 2 * idx + 1
+        else:
+            s = mid + 1
+            idx = 2 * idx + 2
+    t[idx] = value
+    for idx in reversed(path):
+        t[idx] = f([t[2 * idx + 1], t[2 * idx + 2]])
+    return t
+
+
+# the kinds of the array.array typecodes (and struct formats): signed, unsigned integers and floats
+_FORMAT_KINDS = dict([(c, 'i') for c in 'bhilqn'] + [(c, 'u') for c in 'BHILQN'] + [(c, 'f') for c in 'fd'])
+_NATIVE_ORDER = '<' if sys.byteorder == 'little' else '>'
+
+
+def _same_layout(view, typecode, itemsize):
+    """
+    :return:    True if the items of the memoryview can be copied byte by byte into array(typecode), e.g.,
+                the format 'l' of an int64 NumPy array on Linux matches the typecode 'q'
+    """
+    fmt = view.format
+    if fmt[:1] in ('@', '=', _NATIVE_ORDER):
+        fmt = fmt[1:]
+    return (view.ndim == 1 and view.c_contiguous and view.itemsize == itemsize and
+            fmt in _FORMAT_KINDS and _FORMAT_KINDS[fmt] == _FORMAT_KINDS.get(typecode))
+
+
+def _binary(f):
+    """
+    :return:    the binary version of the combine function f, e.g., operator.add for the sum, or f itself
+    """
+    return operator.add if f is sum else f
+
+
+class SegmentTree(object):
+    """
+    Iterative segment tree over an array of n elements kept in a list of exactly 2*n elements:
+    t[n + i] is the i-th element of the array, t[k] = op(t[2*k], t[2*k+1]) for 0 < k < n, t[0] is not used.
+    op has to be associative with identity as its identity element, i.e., op(identity, x) == op(x, identity) == x.
+    It does not need to be commutative: the query combines the left and the right parts of the range separately.
+    The construction takes O(n) time, a query or an update takes O(log(n)) time.
+    """
+
+    def __init__(self, a, op=min, identity=float('inf'), typecode=None, dtype=None):
+        """
+        :param a:           the original array (a sequence, or an object supporting the buffer protocol)
+        :param op:          a binary associative function, e.g., min, max or operator.add (sum is also accepted)
+        :param identity:    the identity element of op: float('inf') for min, -float('inf') for max, 0 for the sum
+        :param typecode:    None to keep the tree in a list, or a typecode of array.array, e.g., 'd' or 'q'
+        :param dtype:       None, or a NumPy dtype, e.g., 'float64' or 'int64', to keep the tree in a NumPy array
+        """
+        self.op = op = _binary(op)
+        self.identity = identity
+        self.n = n = len(a)
+        if dtype is not None:
+            self.t = self._build_array(a, dtype)
+            return
+        if typecode is not None:
+            # the internal nodes are overwritten below, t[0] is not used, so zeros are as good as the identity
+            t = array(typecode, bytes(n * array(typecode).itemsize))
+            try:
+                view = memoryview(a)
+            except TypeError:
+                view = None
+            if view is None:
+                t.extend(a)
+            elif _same_layout(view, typecode, t.itemsize):
+                t.frombytes(view.cast('B'))
+            elif np is not None:  # the values are converted, e.g., from array('i') or float32 into array('q')
+                t.frombytes(np.asarray(view).astype(np.dtype(typecode), casting='same_kind').tobytes())
+            else:
+                t.extend(view.tolist())
+        else:
+            t = [identity] * n
+            t.extend(a)
+        for k in range(n - 1, 0, -1):
+            t[k] = op(t[2 * k], t[2 * k + 1])
+        self.t = t
+
+    def _build_array(self, a, dtype):
+        """
+        The nodes in [(hi + 1) // 2, hi) only have the children in [hi, 2 * hi), so they are computed
+        with one vectorized operation once all the nodes from hi on are ready.
+        """
+        if np is None:
+            raise ImportError('numpy is required for the array-backed storage')
+        n, op = self.n, self.op
+        t = np.zeros(2 * n, dtype=dtype)
+        t[n:] = np.asarray(a)
+        ufunc = _ufunc(op)
+        if ufunc is None:
+            for k in range(n - 1, 0, -1):
+                t[k] = op(t[2 * k], t[2 * k + 1])
+            return t
+        hi = n
+        while hi > 1:
+            lo = (hi + 1) // 2
+            t[lo:hi] = ufunc(t[2 * lo:2 * hi:2], t[2 * lo + 1:2 * hi:2])
+            hi = lo
+        return t
+
+    def __len__(self):
+        return self.n
+
+    def element(self, idx):
+        """
+        :return:    the element of the original array at idx
+        """
+        return self.t[self.n + idx]
+
+    def query(self, q_st, q_end):
+        """
+        :param q_st:    starting position of the query range
+        :param q_end:   ending position of the query range
+        :return:        the value of op of the elements with the indexes in [q_st, q_end] range including both the ends
+        """
+        if q_st < 0 or q_end > self.n - 1 or q_st > q_end:
+            raise RuntimeError("Invalid range arguments")
+        t, op = self.t, self.op
+        res_l = res_r = self.identity
+        lo, hi = q_st + self.n, q_end + self.n + 1
+        while lo < hi:
+            if lo & 1:
+                res_l = op(res_l, t[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                res_r = op(t[hi], res_r)
+            lo >>= 1
+            hi >>= 1
+        return op(res_l, res_r)
+
+    def set_value(self, idx_change, value):
+        """
+        Assign the value to the element at idx_change and recompute its ancestors bottom-up, O(log(n)) time.
+        Works for any associative op and any new value, this is the primary way to update the tree.
+        :param idx_change:  the index in the original array where the element is being updated
+        :param value:       the new value of the element
+        """
+        if not (0 <= idx_change <= self.n - 1):
+            raise IndexError("idx_change=%d is out of bounds" % idx_change)
+        t, op = self.t, self.op
+        k = idx_change + self.n
+        t[k] = value
+        k >>= 1
+        while k:
+            t[k] = op(t[2 * k], t[2 * k + 1])
+            k >>= 1
+
+    def update(self, idx_change, change):
+        """
+        Apply op(element, change) to the element at idx_change and recompute its ancestors, e.g.,
+        for the sum the change is the increment, for min/max it is the new value (see update() above),
+        i.e., set_value(idx_change, op(element, change))
+        :param idx_change:  the index in the original array where the element is being updated
+        :param change:      op-specific change to the element
+        """
+        if not (0 <= idx_change <= self.n - 1):
+            raise IndexError("idx_change=%d is out of bounds" % idx_change)
+        self.set_value(idx_change, self.op(self.t[idx_change + self.n], change))
+
+    def _nodes(self, lo, hi):
+        """
+        :return:    the O(log(n)) nodes exactly covering the elements in [lo, hi), ordered from left to right
+        """
+        lo, hi = lo + self.n, hi + self.n
+        left, right = [], []
+        while lo < hi:
+            if lo & 1:
+                left.append(lo)
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                right.append(hi)
+            lo >>= 1
+            hi >>= 1
+        left.extend(reversed(right))
+        return left
+
+    def max_right(self, q_st, g):
+        """
+        The descent in the style of AtCoder library: find the largest r such that g(op(a[q_st], ..., a[r-1])) holds,
+        assuming g(identity) holds and g is monotone, i.e., once it fails for a range it fails for the longer ones.
+        E.g., for the sum tree, max_right(0, lambda s: s < k) is the first index where the prefix sum reaches k.
+        O(log(n)) time.
+        :param q_st:    starting position of the ranges, 0 <= q_st <= n
+        :param g:       a predicate on the values of op
+        :return:        r, q_st <= r <= n
+        """
+        if not (0 <= q_st <= self.n):
+            raise RuntimeError("Invalid range arguments")
+        t, op, n = self.t, self.op, self.n
+        acc = self.identity
+        for k in self._nodes(q_st, n):
+            nxt = op(acc, t[k])
+            if not g(nxt):
+                while k < n:
+                    k <<= 1
+                    nxt = op(acc, t[k])
+                    if g(nxt):
+                        acc = nxt
+                        k += 1
+                return k - n
+            acc = nxt
+        return n
+
+    def min_left(self, q_end, g):
+        """
+        The symmetric descent: find the smallest l such that g(op(a[l], ..., a[q_end-1])) holds,
+        assuming g(identity) holds and g is monotone.  O(log(n)) time.
+        :param q_end:   the end (exclusive) of the ranges, 0 <= q_end <= n
+        :param g:       a predicate on the values of op
+        :return:        l, 0 <= l <= q_end
+        """
+        if not (0 <= q_end <= self.n):
+            raise RuntimeError("Invalid range arguments")
+        t, op, n = self.t, self.op, self.n
+        acc = self.identity
+        for k in reversed(self._nodes(0, q_end)):
+            nxt = op(t[k], acc)
+            if not g(nxt):
+                while k < n:
+                    k = 2 * k + 1
+                    nxt = op(t[k], acc)
+                    if g(nxt):
+                        acc = nxt
+                        k -= 1
+                return k + 1 - n
+            acc = nxt
+        return 0
+
+    def find_first(self, q_st, predicate_on_node):
+        """
+        Find the first index i >= q_st such that predicate_on_node(a[i]) holds.
+        predicate_on_node has to hold for a node whenever it holds for one of its children and vice versa,
+        e.g., lambda v: v < x for the min tree.  O(log(n)) time.
+        :param q_st:                the starting position of the search
+        :param predicate_on_node:   a predicate on the values of the nodes
+        :return:                    the index, or -1 if there is no such index
+        """
+        if not (0 <= q_st <= self.n):
+            raise RuntimeError("Invalid range arguments")
+        t, n = self.t, self.n
+        for k in self._nodes(q_st, n):
+            if predicate_on_node(t[k]):
+                while k < n:
+                    k <<= 1
+                    if not predicate_on_node(t[k]):
+                        k += 1
+                return k - n
+        return -1
+
+    def find_last(self, q_end, predicate_on_node):
+        """
+        Find the last index i <= q_end such that predicate_on_node(a[i]) holds, see find_first().  O(log(n)) time.
+        :param q_end:               the ending position of the search (included)
+        :param predicate_on_node:   a predicate on the values of the nodes
+        :return:                    the index, or -1 if there is no such index
+        """
+        if not (-1 <= q_end <= self.n - 1):
+            raise RuntimeError("Invalid range arguments")
+        t, n = self.t, self.n
+        for k in reversed(self._nodes(0, q_end + 1)):
+            if predicate_on_node(t[k]):
+                while k < n:
+                    k = 2 * k + 1
+                    if not predicate_on_node(t[k]):
+                        k -= 1
+                return k - n
+        return -1
+
+
+def _ufunc(op):
+    if np is None:
+        return None
+    return {min: np.minimum, max: np.maximum, operator.add: np.add}.get(op)
+
+
+def rmq_many(tree, starts, ends):
+    """
+    Batch version of SegmentTree.query(): the same bottom-up walk is done for all the queries at once,
+    level by level, with O(log(n)) vectorized NumPy operations over the arrays of the queries.
+    Falls back to calling tree.query() per pair when NumPy is not installed, or op is not min, max or operator.add.
+    :param tree:    a SegmentTree
+    :param starts:  a sequence (or a NumPy array) of the starting positions of the query ranges
+    :param ends:    a sequence (or a NumPy array) of the ending positions of the query ranges
+    :return:        a NumPy array (a list for the fallback) of the values of op over the ranges [starts[i], ends[i]]
+    """
+    ufunc = _ufunc(tree.op)
+    if ufunc is None:
+        return [tree.query(q_st, q_end) for q_st, q_end in zip(starts, ends)]
+    n = tree.n
+    lo = np.array(starts, dtype=np.int64)
+    hi = np.array(ends, dtype=np.int64) + 1
+    if len(lo) and (lo.min() < 0 or hi.max() > n or (lo >= hi).any()):
+        raise RuntimeError("Invalid range arguments")
+    t = tree.t
+    if isinstance(t, list):
+        t = t[1:2] + t[1:]  # t[0] is not used, the identity there (e.g., inf) would turn an integer tree into float
+    t = np.asarray(t)  # copied once per batch, unless the tree is already kept in a typed buffer
+    # the identity is not used as the initial value, it may not fit into the dtype of the tree (inf for integers),
+    # instead, the first node taken by a query becomes its initial value
+    res = np.zeros(len(lo), dtype=t.dtype)
+    empty = np.ones(len(lo), dtype=bool)
+
+    def _accumulate(take, nodes):
+        values = t[nodes[take]]
+        res[take] = np.where(empty[take], values, ufunc(res[take], values))
+        empty[take] = False
+
+    lo += n
+    hi += n
+    while True:
+        active = lo < hi
+        if not active.any():
+            return res
+        take = active & (lo & 1).astype(bool)
+        _accumulate(take, lo)
+        lo += take
+        take = active & (hi & 1).astype(bool)
+        hi -= take
+        _accumulate(take, hi)
+        lo >>= 1
+        hi >>= 1
+
+
+class ArgSegmentTree(object):
+    """
+    Segment tree for the indexes of the min (max) elements in the ranges, with the same exactly 2*n layout as
+    SegmentTree: t[n + i] = i, t[k] is the index of the leftmost min (max) element of the subtree of k.
+    The indexes are kept in array('q') (8 bytes per node), -1 stands for "no index".
+    The construction takes O(n) time, a query or an update takes O(log(n)) time.
+    """
+
+    def __init__(self, a, f=min):
+        """
+        :param a:   the original array (a sequence), it is copied into a list
+        :param f:   min or max
+        """
+        if f is not min and f is not max:
+            raise ValueError('f has to be either min or max')
+        self.f = f
+        self.a = a = list(a)
+        self.n = n = len(a)
+        self.t = t = array('q', [-1]) * n
+        t.extend(range(n))
+        pick = self._pick
+        for k in range(n - 1, 0, -1):
+            t[k] = pick(t[2 * k], t[2 * k + 1])
+
+    def __len__(self):
+        return self.n
+
+    def _pick(self, x, y):
+        """
+        :return:    the index of the smaller (greater for max) element among a[x] and a[y], the smaller index on ties
+        """
+        if x < 0:
+            return y
+        if y < 0:
+            return x
+        ax, ay = self.a[x], self.a[y]
+        if ax == ay:
+            return x if x < y else y
+        if self.f is min:
+            return x if ax < ay else y
+        return x if ax > ay else y
+
+    def arg_query(self, q_st, q_end):
+        """
+        :param q_st:    starting position of the query range
+        :param q_end:   ending position of the query range
+        :return:        the leftmost index of the min (max) of the elements with the indexes in [q_st, q_end]
+        """
+        if q_st < 0 or q_end > self.n - 1 or q_st > q_end:
+            raise RuntimeError("Invalid range arguments")
+        t, pick = self.t, self._pick
+        res = -1
+        lo, hi = q_st + self.n, q_end + self.n + 1
+        while lo < hi:
+            if lo & 1:
+                res = pick(res, t[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                res = pick(t[hi], res)
+            lo >>= 1
+            hi >>= 1
+        return res
+
+    def query(self, q_st, q_end):
+        """
+        :return:    the min (max) of the elements with the indexes in [q_st, q_end] range including both the ends
+        """
+        return self.a[self.arg_query(q_st, q_end)]
+
+    def set_value(self, idx_change, value):
+        """
+        Assign the value to a[idx_change] and recompute the ancestors of its leaf, O(log(n)) time.
+        """
+        if not (0 <= idx_change <= self.n - 1):
+            raise IndexError("idx_change=%d is out of bounds" % idx_change)
+        self.a[idx_change] = value
+        t, pick = self.t, self._pick
+        k = (idx_change + self.n) >> 1
+        while k:
+            t[k] = pick(t[2 * k], t[2 * k + 1])
+            k >>= 1
+
+
+class LazySegmentTree(object):
+    """
+    Segment tree with lazy propagation of the range updates "add delta" and "assign value".
+    The tree is padded to size = 2**h >= n leaves, t[size + i] is the i-th element, the children of k are 2*k, 2*k+1.
+    A pending update of a node is kept as a pair (assign, add): first assign the value unless it is None,
+    then add; it is pushed down to the children before they are visited.
+    Range updates and range queries take O(log(n)) time.
+    """
+
+    def __init__(self, a, f=min):
+        """
+        :param a:   the original array (a sequence)
+        :param f:   min, max or sum (operator.add is also accepted)
+        """
+        if f is min:
+            identity = float('inf')
+        elif f is max:
+            identity = -float('inf')
+        elif f is sum or f is operator.add:
+            identity = 0
+        else:
+            raise ValueError('f has to be one of min, max or sum')
+        self.op = _binary(f)
+        self.is_sum = self.op is operator.add
+        self.identity = identity
+        self.n = n = len(a)
+        self.h = (n - 1).bit_length() if n else 0
+        self.size = size = 1 << self.h
+        self.t = t = [identity] * (2 * size)
+        t[size:size + n] = a
+        for k in range(size - 1, 0, -1):
+            t[k] = self.op(t[2 * k], t[2 * k + 1])
+        self.lz_assign = [None] * size
+        self.lz_add = [0] * size
+
+    def __len__(self):
+        return self.n
+
+    def _apply(self, k, assign, add):
+        if self.is_sum:
+            width = self.size >> (k.bit_length() - 1)
+            if assign is not None:
+                self.t[k] = assign * width
+            self.t[k] += add * width
+        else:
+            if assign is not None:
+                self.t[k] = assign
+            self.t[k] += add
+        if k < self.size:
+            if assign is not None:
+                self.lz_assign[k], self.lz_add[k] = assign, add
+            else:
+                self.lz_add[k] += add
+
+    def _push(self, k):
+        assign, add = self.lz_assign[k], self.lz_add[k]
+        if assign is not None or add:
+            self._apply(2 * k, assign, add)
+            self._apply(2 * k + 1, assign, add)
+            self.lz_assign[k], self.lz_add[k] = None, 0
+
+    def _push_borders(self, lo, hi):
+        for i in range(self.h, 0, -1):
+            if ((lo >> i) << i) != lo:
+                self._push(lo >> i)
+            if ((hi >> i) << i) != hi:
+                self._push((hi - 1) >> i)
+
+    def _check_range(self, q_st, q_end):
+        if q_st < 0 or q_end > self.n - 1 or q_st > q_end:
+            raise RuntimeError("Invalid range arguments")
+
+    def _update_range(self, q_st, q_end, assign, add):
+        self._check_range(q_st, q_end)
+        t, op = self.t, self.op
+        lo, hi = q_st + self.size, q_end + self.size + 1
+        self._push_borders(lo, hi)
+        l2, h2 = lo, hi
+        while l2 < h2:
+            if l2 & 1:
+                self._apply(l2, assign, add)
+                l2 += 1
+            if h2 & 1:
+                h2 -= 1
+                self._apply(h2, assign, add)
+            l2 >>= 1
+            h2 >>= 1
+        for i in range(1, self.h + 1):
+            if ((lo >> i) << i) != lo:
+                k = lo >> i
+                t[k] = op(t[2 * k], t[2 * k + 1])
+            if ((hi >> i) << i) != hi:
+                k = (hi - 1) >> i
+                t[k] = op(t[2 * k], t[2 * k + 1])
+
+    def add_range(self, q_st, q_end, delta):
+        """
+        Add delta to all the elements with the indexes in [q_st, q_end] including both the ends, O(log(n)) time
+        """
+        self._update_range(q_st, q_end, None, delta)
+
+    def assign_range(self, q_st, q_end, value):
+        """
+        Set all the elements with the indexes in [q_st, q_end] including both the ends to value, O(log(n)) time
+        """
+        self._update_range(q_st, q_end, value, 0)
+
+    def query(self, q_st, q_end):
+        """
+        :return:    the value of f of the elements with the indexes in [q_st, q_end] range including both the ends
+        """
+        self._check_range(q_st, q_end)
+        t, op = self.t, self.op
+        lo, hi = q_st + self.size, q_end + self.size + 1
+        self._push_borders(lo, hi)
+        res_l = res_r = self.identity
+        while lo < hi:
+            if lo & 1:
+                res_l = op(res_l, t[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                res_r = op(t[hi], res_r)
+            lo >>= 1
+            hi >>= 1
+        return op(res_l, res_r)
+
+    def element(self, idx):
+        """
+        :return:    the current value of the element at idx
+        """
+        return self.query(idx, idx)
+
+
 if __name__ == '__main__':
     """
     Keeping some tests here as examples of the usage.
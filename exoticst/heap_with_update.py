@@ -2,10 +2,21 @@
 The standard Python heapq interface does not contain methods for efficient updates of
 a value of a heap element.   Dijkstra algorithm is an example where such functionality is useful.
 This Python implementation of Heap contains methods decrease() and update() with logarithmic time complexity.
+Any element can be removed by its key in logarithmic time, remove(), and with maxlen given, e.g.,
+UpdatableHeap(maxlen=k), the heap keeps only the k elements with the largest heap keys (a streaming top-k):
+when it is full, push() evicts the root, i.e., the element with the smallest heap key.
+When the keys are dense integers 0, 1, ..., n-1, e.g., vertex ids, UpdatableHeap(capacity=n) keeps the register
+in a preallocated list of the positions (None for the absent keys) instead of a dict, which makes every swap of
+the elements cheaper.
+
+ArrayUpdatableHeap has the same interface, but keeps the heap as a "struct of arrays": parallel lists of
+heap keys (priorities), keys, data and insertion counters.  No tuple is allocated per operation (except the
+HeapElement returned by pop()), and only the priorities are compared, the ties are broken by the insertion order.
 
 """
 
 from collections import namedtuple
+from heapq import heappop, heappush
 
 HeapElement = namedtuple('HeapElement', ['heap_key', 'key', 'data'])
 
@@ -16,28 +27,109 @@ class UpdatableHeap(object):
     the members 'heap_key' and 'key' of HeapElement are set to the weight and end vertex of a graph edge respectively,
     while the data is not used.
     Invariants: self.heap satisfies the heap invariant condition at the beginning and at the end of the methods.
+    The heap is d-ary, d = arity: the children of the element at index k are at d*k+1, ..., d*k+d.
+    A larger arity makes the tree shallower, i.e., cheaper push() and decrease(), at the price of comparing
+    d children per level in pop(); see benchmarks/bench_heap.py for the comparison of the arities.
     """
 
     ZERO_POZ = 0
 
-    def __init__(self):
+    def __init__(self, arity=2, maxlen=None, capacity=None):
+        """
+        :param arity:       the number of the children of a node of the heap, 2 for the binary heap
+        :param maxlen:      None for an unbounded heap, or the maximal number of the elements, see push()
+        :param capacity:    None for any hashable keys, or n for the integer keys in range(n),
+                            which are registered in a preallocated list instead of a dict
         """
+        if arity < 2:
+            raise ValueError('arity=%r, it has to be at least 2' % (arity,))
+        if maxlen is not None and maxlen < 1:
+            raise ValueError('maxlen=%r, it has to be at least 1' % (maxlen,))
+        self.arity = arity
+        self.maxlen = maxlen
+        self.capacity = capacity
+        self.heap = []  # a d-ary tree, the indexes of the children of the element at index k are d*k+1, ..., d*k+d
+        # maps the heap key (e.g., vertex) into the heap index of the element with given key
+        self.register = {} if capacity is None else [None] * capacity
 
+    @classmethod
+    def from_items(cls, iterable, arity=2, capacity=None):
         """
-        self.heap = []  # a binary tree with the indexes of the children of the element at index k are 2*k+1 and 2*k+2
-        self.register = {}  # maps the heap key (e.g., vertex) into the heap index of the element with given key
+        Build the heap from (heap_key, key, data) items in O(n) time: the register is filled in while the elements
+        are collected, then the internal nodes are bubbled down from the last one to the root (heapify).
+        :param iterable:    the items (heap_key, key, data), the keys have to be distinct
+        :param arity:       see __init__()
+        :param capacity:    see __init__()
+        :return:            a new heap
+        """
+        heap = cls(arity=arity, capacity=capacity)
+        register = heap.register
+        for x in iterable:
+            el = HeapElement(*x)
+            if capacity is not None:
+                heap._check_key(el.key)
+            if el.key in heap:
+                raise ValueError('The keys of the items have to be distinct')
+            register[el.key] = len(heap.heap)
+            heap.heap.append(el)
+        for pos in range((len(heap.heap) - 2) // arity, -1, -1):
+            heap._bubble_down(pos)
+        return heap
 
     def __len__(self):
         return len(self.heap)
 
+    def __contains__(self, key):
+        return self._get_position(key) is not None
+
+    def _check_key(self, key):
+        if not 0 <= key < self.capacity:
+            raise IndexError('key=%r is out of range(%d)' % (key, self.capacity))
+
+    def _get_position(self, key):
+        """
+        :return:    the heap index of the element with the key, None if there is no such element
+        """
+        if self.capacity is None:
+            return self.register.get(key)
+        return self.register[key] if 0 <= key < self.capacity else None
+
+    def _unregister(self, key):
+        if self.capacity is None:
+            del self.register[key]
+        else:
+            self.register[key] = None
+
+    def peek(self):
+        """
+        :return:    the head of the heap, i.e., the element with the minimal heap_key, without removing it
+        """
+        if not self.heap:
+            raise IndexError('peek into an empty heap')
+        return self.heap[self.ZERO_POZ]
+
     def push(self, heap_key, key, data):
         """
         Create a new heap element and register (map) its index.
+        If the heap is bounded and full, the element with the minimal heap_key is evicted: either the root,
+        which is replaced with the new element, or the new element itself, if it is not greater than the root.
         :param heap_key:    when used in dijkstra, this is the weight of the edge ending with the vertex
         :param key:         when used in dijkstra, this is the end vertex of the edge
         :param data:        this parameter is not used in dijkstra
+        :return:            the evicted element, or None if nothing was evicted
         """
+        if self.capacity is not None:
+            self._check_key(key)
         el = HeapElement(heap_key, key, data)
+        if self.maxlen is not None and len(self.heap) >= self.maxlen:
+            root = self.heap[self.ZERO_POZ]
+            if el <= root:
+                return el
+            self._unregister(root.key)
+            self.heap[self.ZERO_POZ] = el
+            self.register[key] = self.ZERO_POZ
+            self._bubble_down(self.ZERO_POZ)
+            return root
         self.heap.append(el)
         idx = self.register[key] = len(self.heap) - 1
         self._bubble_up(idx)
@@ -51,7 +143,7 @@ class UpdatableHeap(object):
         :return:            the head of the heap, i.e., the element with the minimal heap_key
         """
         self._swap_heap_and_register(self.ZERO_POZ, len(self.heap) - 1)
-        del self.register[self.heap[-1].key]
+        self._unregister(self.heap[-1].key)
         result_el = self.heap.pop()
         self._bubble_down(self.ZERO_POZ)
         return result_el
@@ -67,8 +159,8 @@ class UpdatableHeap(object):
         :param key:         when used in dijkstra, this is the end vertex of the edge
         :param data:        this parameter is not used in dijkstra
         """
-        idx = self.register.get(key)
-        if not idx:  # no element with the key is present in the heap, create it
+        idx = self._get_position(key)
+        if idx is None:  # no element with the key is present in the heap, create it
             self.push(new_heap_key, key, data)
         else:
             self.heap[idx] = HeapElement(new_heap_key, key, data)
@@ -83,20 +175,62 @@ class UpdatableHeap(object):
         :param key: value of key, which is in case of Dijkstra is the end vertex of the edge
         :param data: value of data, which is no used in case of Dijkstra is not used
         """
-        idx = self.register[key]
+        idx = self._position(key)
         self.heap[idx] = HeapElement(new_heap_key, key, data)
-        pos = self._bubble_up(idx)  # works only if new_heap_key is less than the old value of heap_key
-        if pos != idx:
-            self._bubble_down(idx)  # get here only if new_heap_key is greater than the old value of heap_key
+        pos = self._bubble_up(idx)  # moves the element only if new_heap_key is less than the old value of heap_key
+        if pos == idx:
+            self._bubble_down(idx)  # moves the element only if new_heap_key is greater than the old value
+
+    def remove(self, key):
+        """
+        Remove the element with the given key, which *exists* in the heap, in logarithmic time:
+        the element is exchanged with the last one, which is then moved into its place.
+        :param key: value of key, which is in case of Dijkstra is the end vertex of the edge
+        :return:    the removed element
+        """
+        idx = self._position(key)
+        last_idx = len(self.heap) - 1
+        self._swap_heap_and_register(idx, last_idx)
+        self._unregister(key)
+        result_el = self.heap.pop()
+        if idx < last_idx:
+            if self._bubble_up(idx) == idx:
+                self._bubble_down(idx)
+        return result_el
+
+    def _position(self, key):
+        idx = self._get_position(key)
+        if idx is None:
+            raise KeyError(key)
+        return idx
 
     def sorted_iterator(self):
         """
-        Yield heap elements in sorted order
+        Yield heap elements in sorted order; the heap and its register are restored after the iteration.
+        See iter_smallest() for the iteration which does not modify the heap at all.
         """
-        heap_store = self.heap[:]
+        heap_store, register_store = self.heap[:], self.register.copy()
         while self.heap:
             yield self.pop()
         self.heap[:] = heap_store
+        self.register = register_store
+
+    def iter_smallest(self, k):
+        """
+        Yield the k smallest heap elements in sorted order without modifying the heap, O(k*log(k)) time:
+        a frontier of the candidates is kept in an auxiliary heap, starting with the root; when an element is
+        yielded, its children become the candidates.  The heap must not be changed during the iteration.
+        :param k:   the number of the elements to yield (all of them if k >= len(self))
+        """
+        heap, arity = self.heap, self.arity
+        frontier = [(heap[0], 0)] if heap and k > 0 else []
+        while frontier and k > 0:
+            el, pos = heappop(frontier)
+            yield el
+            k -= 1
+            chld_idx = pos * arity + 1
+            for chld_idx in range(chld_idx, min(chld_idx + arity, len(heap))):
+                heappush(frontier, (heap[chld_idx], chld_idx))
 
     def heapsort(self, lst):
         """
@@ -104,26 +238,28 @@ class UpdatableHeap(object):
         :param lst: a list to be sorted; it is pushed into self.heap before returning self.heap in sorted order
         :return: a sorted list
         """
-        result, heap_store = [], []
+        result = []
         for x in lst:
             self.push(*x)
-        heap_store = self.heap[:]
+        heap_store, register_store = self.heap[:], self.register.copy()
         while self.heap:
             x = self.pop()
             result.append((x.heap_key, x.key, x.data))
         self.heap = heap_store[:]  # restore self.heap to the state when lst was pushed into it
+        self.register = register_store
         return result
 
     def _bubble_up(self, pos):
         """
         Move the element in pos into the position where the heap invariant holds,
         while updating all the indexes in the registry for all the element moved in the process.
-        Reminder:  Parent's index of and element at index j is (j-1)//2
+        Reminder:  Parent's index of and element at index j is (j-1)//d
         :param pos: initial position of the element to bubble up
         :return:    the final position of the element, where it does not break the heap invariant
         """
+        arity = self.arity
         while pos > self.ZERO_POZ:
-            parent_idx = (pos - 1) >> 1
+            parent_idx = (pos - 1) // arity
             pos_key = self.heap[pos].key
             if self.heap[parent_idx] <= self.heap[pos]:
                 self.register[pos_key] = pos
@@ -137,26 +273,179 @@ class UpdatableHeap(object):
         Move the element in pos into the position where the heap invariant holds,
         while updating all the indexes in the registry for all the element moved in the process:
         Exchange the element in pos with the smallest of its children if needed; continue until the invariant holds
-        Reminder: Indexes of the children of k are 2*k+1 and 2*k+2
+        Reminder: Indexes of the children of k are d*k+1, ..., d*k+d
         :param pos: initial pos of the element to bubble down
         :return:    the final position of the element, where it does not break the heap invariant
         """
-        while (pos << 1) + 1 < len(self.heap):
-            chld_idx, chld2_idx = (pos << 1) + 1, (pos << 1) + 2
-            min_chld_idx = (chld2_idx if (chld2_idx < len(self.heap)) and
-                                         self.heap[chld2_idx] < self.heap[chld_idx] else chld_idx)
-            if self.heap[pos] <= self.heap[min_chld_idx]:
+        heap, arity = self.heap, self.arity
+        size = len(heap)
+        while pos * arity + 1 < size:
+            chld_idx = pos * arity + 1
+            min_chld_idx = chld_idx
+            for chld2_idx in range(chld_idx + 1, min(chld_idx + arity, size)):
+                if heap[chld2_idx] < heap[min_chld_idx]:
+                    min_chld_idx = chld2_idx
+            if heap[pos] <= heap[min_chld_idx]:
                 return pos
             self._swap_heap_and_register(pos, min_chld_idx)
             pos = min_chld_idx
         return pos
 
     def _swap_heap_and_register(self, idx, idx2):
+        """
+        Exchange the elements at any two positions idx and idx2 of the heap and their indexes in the registry
+        """
         idx_key, idx2_key = self.heap[idx].key, self.heap[idx2].key
         self.register[idx2_key], self.register[idx_key] = idx, idx2
         self.heap[idx2], self.heap[idx] = self.heap[idx], self.heap[idx2]
 
 
+class ArrayUpdatableHeap(object):
+    """
+    The same interface as UpdatableHeap, with the elements kept in the parallel lists heap_keys, keys, data and seqs,
+    where seqs[j] is the insertion counter of the j-th element, which breaks the ties between equal heap keys,
+    so the elements with equal heap keys are popped in the order they were pushed (FIFO).
+    The sifts move a "hole" instead of swapping the elements, the register is updated once per moved element.
+    """
+
+    def __init__(self):
+        self.heap_keys = []  # the priorities; the children of the element at index k are at 2*k+1 and 2*k+2
+        self.keys = []
+        self.data = []
+        self.seqs = []
+        self.register = {}  # maps the key (e.g., vertex) into the heap index of the element with given key
+        self.counter = 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def push(self, heap_key, key, data):
+        """
+        Create a new heap element and register (map) its index.
+        :param heap_key:    when used in dijkstra, this is the weight of the edge ending with the vertex
+        :param key:         when used in dijkstra, this is the end vertex of the edge
+        :param data:        this parameter is not used in dijkstra
+        """
+        self.heap_keys.append(heap_key)
+        self.keys.append(key)
+        self.data.append(data)
+        self.seqs.append(self.counter)
+        self.counter += 1
+        self._bubble_up(len(self.keys) - 1)
+
+    def pop(self):
+        """
+        Pop the head of the heap and fix internal accounting.
+        :return:    the head of the heap, i.e., the element with the minimal heap_key, as a HeapElement
+        """
+        result_el = HeapElement(self.heap_keys[0], self.keys[0], self.data[0])
+        del self.register[result_el.key]
+        heap_key, key, data, seq = self.heap_keys.pop(), self.keys.pop(), self.data.pop(), self.seqs.pop()
+        if self.keys:
+            self.heap_keys[0], self.keys[0], self.data[0], self.seqs[0] = heap_key, key, data, seq
+            self._bubble_down(0)
+        return result_el
+
+    def decrease(self, new_heap_key, key, data):
+        """
+        If no element with the key present in the heap, create it.
+        Otherwise, *assume* that, the new_heap_key is less then the value of the heap_key for the key
+        and replace heap_key with new_heap_key; fix the heap invariant.
+        """
+        idx = self.register.get(key)
+        if idx is None:
+            self.push(new_heap_key, key, data)
+        else:
+            self.heap_keys[idx], self.data[idx] = new_heap_key, data
+            self._bubble_up(idx)
+
+    def update(self, new_heap_key, key, data):
+        """
+        Assume that the given key *exists* in the heap, replace its heap_key with new_heap_key, which can be
+        either less or greater than the old one; fix the heap invariant.
+        """
+        idx = self.register[key]
+        self.heap_keys[idx], self.data[idx] = new_heap_key, data
+        if self._bubble_up(idx) == idx:
+            self._bubble_down(idx)
+
+    def sorted_iterator(self):
+        """
+        Yield heap elements in sorted order, the heap is restored after the iteration
+        """
+        store = self.heap_keys[:], self.keys[:], self.data[:], self.seqs[:], dict(self.register)
+        while self.keys:
+            yield self.pop()
+        self.heap_keys, self.keys, self.data, self.seqs, self.register = store
+
+    def heapsort(self, lst):
+        """
+        Returns a sorted list, which is pushed into the heap
+        :param lst: a list of (heap_key, key, data) to be sorted; it is pushed into the heap before sorting
+        :return: a sorted list
+        """
+        for x in lst:
+            self.push(*x)
+        return [(x.heap_key, x.key, x.data) for x in self.sorted_iterator()]
+
+    def _bubble_up(self, pos):
+        """
+        Move the element in pos up into the position where the heap invariant holds,
+        while updating the indexes in the registry for all the elements moved in the process.
+        :param pos: initial position of the element to bubble up
+        :return:    the final position of the element
+        """
+        heap_keys, keys, data, seqs, register = self.heap_keys, self.keys, self.data, self.seqs, self.register
+        heap_key, key, datum, seq = heap_keys[pos], keys[pos], data[pos], seqs[pos]
+        start = pos
+        while pos > 0:
+            parent_idx = (pos - 1) >> 1
+            parent_heap_key = heap_keys[parent_idx]
+            if parent_heap_key < heap_key or (parent_heap_key == heap_key and seqs[parent_idx] < seq):
+                break
+            heap_keys[pos], data[pos], seqs[pos] = parent_heap_key, data[parent_idx], seqs[parent_idx]
+            keys[pos] = parent_key = keys[parent_idx]
+            register[parent_key] = pos
+            pos = parent_idx
+        if pos != start:
+            heap_keys[pos], keys[pos], data[pos], seqs[pos] = heap_key, key, datum, seq
+        register[key] = pos
+        return pos
+
+    def _bubble_down(self, pos):
+        """
+        Move the element in pos down into the position where the heap invariant holds,
+        while updating the indexes in the registry for all the elements moved in the process.
+        :param pos: initial pos of the element to bubble down
+        :return:    the final position of the element
+        """
+        heap_keys, keys, data, seqs, register = self.heap_keys, self.keys, self.data, self.seqs, self.register
+        heap_key, key, datum, seq = heap_keys[pos], keys[pos], data[pos], seqs[pos]
+        size = len(keys)
+        start = pos
+        while True:
+            chld_idx = (pos << 1) + 1
+            if chld_idx >= size:
+                break
+            chld_heap_key = heap_keys[chld_idx]
+            chld2_idx = chld_idx + 1
+            if chld2_idx < size:
+                chld2_heap_key = heap_keys[chld2_idx]
+                if chld2_heap_key < chld_heap_key or (chld2_heap_key == chld_heap_key and
+                                                      seqs[chld2_idx] < seqs[chld_idx]):
+                    chld_idx, chld_heap_key = chld2_idx, chld2_heap_key
+            if heap_key < chld_heap_key or (heap_key == chld_heap_key and seq < seqs[chld_idx]):
+                break
+            heap_keys[pos], data[pos], seqs[pos] = chld_heap_key, data[chld_idx], seqs[chld_idx]
+            keys[pos] = chld_key = keys[chld_idx]
+            register[chld_key] = pos
+            pos = chld_idx
+        if pos != start:
+            heap_keys[pos], keys[pos], data[pos], seqs[pos] = heap_key, key, datum, seq
+        register[key] = pos
+        return pos
+
+
 if __name__ == '__main__':
     """
     Keeping some tests here as examples of the usage.
@@ -0,0 +1,153 @@
+"""
+Pairing Heap with O(1) amortized push() and decrease(), and O(log(n)) amortized pop().
+
+The binary UpdatableHeap from heap_with_update module decreases a heap key in O(log(n)) time: the element is
+bubbled up, and its index in the register is rewritten on every level.  A pairing heap is a tree where every node
+has any number of children, all of them with the heap keys not less than the heap key of the node.
+To decrease the heap key of a node, it is enough to cut its subtree off the tree and to meld it with the root:
+one comparison and a few pointer changes, while the register maps a key to its node, which never moves.
+The work is deferred to pop(): the children of the removed root are melded in pairs from left to right,
+then the pairs are melded from right to left (two-pass pairing).
+
+It pays off when the decreases outnumber the pops, e.g., in Dijkstra algorithm on dense graphs,
+see DijkstraSearch(g, heap_cls=PairingHeap) and benchmarks/bench_heap.py.
+
+Reference:
+M. L. Fredman, R. Sedgewick, D. D. Sleator, R. E. Tarjan, The pairing heap: A new form of self-adjusting heap
+"""
+
+from exoticst.heap_with_update import HeapElement
+
+
+class _Node(object):
+    """
+    A node of the pairing heap: child is the leftmost child, sibling is the next sibling to the right,
+    prev is the previous sibling, or the parent for the leftmost child
+    """
+    __slots__ = ('heap_key', 'key', 'data', 'child', 'sibling', 'prev')
+
+    def __init__(self, heap_key, key, data):
+        self.heap_key, self.key, self.data = heap_key, key, data
+        self.child = self.sibling = self.prev = None
+
+
+class PairingHeap(object):
+    """
+    The same interface as UpdatableHeap: push(), pop(), decrease(), update() and len().
+    Only the heap keys are compared.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.register = {}  # maps the key (e.g., vertex) into its node
+
+    def __len__(self):
+        return len(self.register)
+
+    @staticmethod
+    def _meld(a, b):
+        """
+        Meld two trees: the root with the greater heap key becomes the leftmost child of the other one
+        """
+        if b.heap_key < a.heap_key:
+            a, b = b, a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.prev = b
+        b.prev = a
+        a.child = b
+        return a
+
+    @staticmethod
+    def _cut(node):
+        """
+        Detach the subtree of node (not the root) from its parent and siblings
+        """
+        if node.prev.child is node:
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = node.prev
+        node.prev = node.sibling = None
+
+    def _merge_pairs(self, first):
+        """
+        Two-pass pairing of the siblings starting with first
+        :return:    the root of the resulting tree, or None if there are no siblings
+        """
+        pairs = []
+        while first is not None:
+            a, b = first, first.sibling
+            a.prev = a.sibling = None
+            if b is None:
+                pairs.append(a)
+                break
+            first = b.sibling
+            b.prev = b.sibling = None
+            pairs.append(self._meld(a, b))
+        if not pairs:
+            return None
+        root = pairs.pop()
+        while pairs:
+            root = self._meld(pairs.pop(), root)
+        return root
+
+    def push(self, heap_key, key, data):
+        """
+        Create a new heap element, O(1) time.
+        :param heap_key:    when used in dijkstra, this is the weight of the edge ending with the vertex
+        :param key:         when used in dijkstra, this is the end vertex of the edge
+        :param data:        this parameter is not used in dijkstra
+        """
+        node = self.register[key] = _Node(heap_key, key, data)
+        self.root = node if self.root is None else self._meld(self.root, node)
+
+    def pop(self):
+        """
+        Pop the head of the heap, O(log(n)) amortized time.
+        :return:    the head of the heap, i.e., the element with the minimal heap_key, as a HeapElement
+        """
+        root = self.root
+        if root is None:
+            raise IndexError('pop from an empty heap')
+        del self.register[root.key]
+        self.root = self._merge_pairs(root.child)
+        root.child = None
+        return HeapElement(root.heap_key, root.key, root.data)
+
+    def decrease(self, new_heap_key, key, data):
+        """
+        If no element with the key present in the heap, create it.
+        Otherwise, *assume* that the new_heap_key is not greater than the heap_key for the key,
+        cut the node off its parent and meld it with the root, O(1) time.
+        """
+        node = self.register.get(key)
+        if node is None:
+            self.push(new_heap_key, key, data)
+            return
+        node.heap_key, node.data = new_heap_key, data
+        if node is not self.root:
+            self._cut(node)
+            self.root = self._meld(self.root, node)
+
+    def update(self, new_heap_key, key, data):
+        """
+        Assume that the given key *exists* in the heap, replace its heap_key with new_heap_key, which can be
+        either less or greater than the old one.  An increase removes the node and pushes it again,
+        O(log(n)) amortized time.
+        """
+        node = self.register[key]
+        if not (node.heap_key < new_heap_key):
+            self.decrease(new_heap_key, key, data)
+            return
+        if node is self.root:
+            self.root = self._merge_pairs(node.child)
+        else:
+            self._cut(node)
+            children = self._merge_pairs(node.child)
+            if children is not None:
+                self.root = self._meld(self.root, children)
+        node.child = None
+        node.heap_key, node.data = new_heap_key, data
+        self.root = node if self.root is None else self._meld(self.root, node)
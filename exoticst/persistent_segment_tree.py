@@ -0,0 +1,156 @@
+"""
+Persistent (versioned) segment tree for the range queries "as of version v".
+
+Keeping a full copy of the tree per change costs O(n) memory per version.  A persistent segment tree copies
+only the path from the root to the changed leaf: every update creates O(log(n)) new nodes and a new root,
+while all the other nodes are shared with the previous version.  Each retained version can be queried
+in O(log(n)) time, as if it was a separate tree.
+
+The nodes are immutable tuples (value, left, right), so the nodes which are not reachable from any retained
+version are reclaimed by Python as soon as the versions are dropped, see drop() and drop_before().
+
+For a given array a:
+t = PersistentSegmentTree(a)                                  # range minimum, version 0 is the original array
+t = PersistentSegmentTree(a, op=operator.add, identity=0)    # range sum
+v1 = t.set_value(j, x)                                        # a new version with a[j] = x, based on the latest one
+v2 = t.set_value(k, y, version=0)                             # or on any retained version
+t.rmq(v1, i, j)                                               # the query against the version v1
+t.drop_before(v2)                                             # forget all the versions older than v2
+
+Also see full_bin_tree_for_rmq module in this library for the non-persistent trees.
+"""
+
+from exoticst.full_bin_tree_for_rmq import _binary
+
+
+class PersistentSegmentTree(object):
+    """
+    The tree over the indexes [0, n-1]: the node for [s, e] with s < e has the children for [s, mid] and
+    [mid+1, e], mid = (s + e) // 2, and keeps op of the elements of its range.
+    op has to be associative with identity as its identity element.
+    The construction takes O(n) time, an update takes O(log(n)) time and space, a query takes O(log(n)) time.
+    """
+
+    def __init__(self, a, op=min, identity=float('inf')):
+        """
+        :param a:           the original array, it becomes the version 0
+        :param op:          a binary associative function, e.g., min, max or operator.add (sum is also accepted)
+        :param identity:    the identity element of op: float('inf') for min, -float('inf') for max, 0 for the sum
+        """
+        self.op = _binary(op)
+        self.identity = identity
+        self.n = len(a)
+        self.roots = {0: self._build(a, 0, self.n - 1) if self.n else None}
+        self.latest = 0
+
+    def _build(self, a, start, end):
+        if start == end:
+            return a[start], None, None
+        mid = (start + end) // 2
+        left, right = self._build(a, start, mid), self._build(a, mid + 1, end)
+        return self.op(left[0], right[0]), left, right
+
+    def _root(self, version):
+        try:
+            return self.roots[version]
+        except KeyError:
+            raise KeyError('version %r is not retained' % (version,))
+
+    def versions(self):
+        """
+        :return:    the sorted list of the retained versions
+        """
+        return sorted(self.roots)
+
+    def set_value(self, idx_change, value, version=None):
+        """
+        Create a new version, where the element at idx_change is set to value, O(log(n)) time and new nodes.
+        :param idx_change:  the index in the original array where the element is being updated
+        :param value:       the new value of the element
+        :param version:     the version to base the new version on, the latest one by default
+        :return:            the number of the new version
+        """
+        if not (0 <= idx_change <= self.n - 1):
+            raise IndexError("idx_change=%d is out of bounds" % idx_change)
+        op = self.op
+        node = self._root(self.latest if version is None else version)
+        path = []
+        s, e = 0, self.n - 1
+        while s < e:
+            mid = (s + e) // 2
+            go_left = idx_change <= mid
+            path.append((node, go_left))
+            if go_left:
+                node, e = node[1], mid
+            else:
+                node, s = node[2], mid + 1
+        new = (value, None, None)
+        for node, go_left in reversed(path):
+            if go_left:
+                new = (op(new[0], node[2][0]), new, node[2])
+            else:
+                new = (op(node[1][0], new[0]), node[1], new)
+        self.latest += 1
+        self.roots[self.latest] = new
+        return self.latest
+
+    def update(self, idx_change, change, version=None):
+        """
+        Create a new version, where the element at idx_change is replaced with op(element, change),
+        e.g., for the sum the change is the increment, see set_value()
+        :return:    the number of the new version
+        """
+        return self.set_value(idx_change, self.op(self.element(idx_change, version), change), version)
+
+    def element(self, idx, version=None):
+        """
+        :return:    the element at idx in the given version, the latest one by default
+        """
+        if not (0 <= idx <= self.n - 1):
+            raise IndexError("idx=%d is out of bounds" % idx)
+        node = self._root(self.latest if version is None else version)
+        s, e = 0, self.n - 1
+        while s < e:
+            mid = (s + e) // 2
+            if idx <= mid:
+                node, e = node[1], mid
+            else:
+                node, s = node[2], mid + 1
+        return node[0]
+
+    def rmq(self, version, q_st, q_end):
+        """
+        :param version: a retained version
+        :param q_st:    starting position of the query range
+        :param q_end:   ending position of the query range
+        :return:        the value of op of the elements with the indexes in [q_st, q_end] range in the given version
+        """
+        if q_st < 0 or q_end > self.n - 1 or q_st > q_end:
+            raise RuntimeError("Invalid range arguments")
+        op, identity = self.op, self.identity
+
+        def _rmq(node, start, end):
+            if end < q_st or q_end < start:
+                return identity
+            if q_st <= start and end <= q_end:
+                return node[0]
+            mid = (start + end) // 2
+            return op(_rmq(node[1], start, mid), _rmq(node[2], mid + 1, end))
+
+        return _rmq(self._root(version), 0, self.n - 1)
+
+    def drop(self, version):
+        """
+        Forget the version, the nodes not shared with the retained versions are reclaimed
+        """
+        if version == self.latest:
+            raise KeyError('the latest version %r cannot be dropped' % (version,))
+        self._root(version)
+        del self.roots[version]
+
+    def drop_before(self, version):
+        """
+        Forget all the versions older than the given one
+        """
+        for v in [v for v in self.roots if v < min(version, self.latest)]:
+            del self.roots[v]
@@ -0,0 +1,111 @@
+"""
+Monotone Radix Heap for non-negative integer heap keys, with O(1) push() and decrease(),
+and O(log(C)) amortized pop(), where C is the largest difference between a heap key and the last popped one.
+
+A heap is monotone when no heap key less than the last popped heap key is ever pushed,
+which is the case in Dijkstra algorithm with non-negative weights: a new distance is the distance of the
+popped vertex plus a weight.  Then no comparison heap is needed: an element with the heap key x is kept in
+the bucket number (x ^ last).bit_length(), where last is the last popped heap key.  The bucket 0 keeps the
+elements with the heap key equal to last, and the elements of the bucket b > 0 all have the same highest b-1 bits
+as last, except the bit b-1.  pop() takes an element from the bucket 0; when it is empty, the first non-empty
+bucket is scanned for its minimum, which becomes the new last, and its elements are redistributed into
+the lower buckets.  An element moves only to the lower buckets, so it is moved O(log(C)) times.
+
+Every bucket is a dict, so decrease() relocates the element to its new bucket in O(1) time.
+
+For a given heap h = RadixHeap():
+h.push(heap_key, key, data)                 # heap_key is an integer not less than the last popped one
+h.decrease(new_heap_key, key, data)         # the same interface as UpdatableHeap from heap_with_update module
+el = h.pop()                                # HeapElement(heap_key, key, data)
+
+DijkstraSearch(g, heap_cls='auto') from dijkstra_shortest_path module picks RadixHeap for the small integer weights.
+
+Reference:
+R. K. Ahuja, K. Mehlhorn, J. B. Orlin, R. E. Tarjan, Faster algorithms for the shortest path problem
+"""
+
+from exoticst.heap_with_update import HeapElement
+
+
+class RadixHeap(object):
+    """
+    The same interface as UpdatableHeap: push(), pop(), decrease(), update() and len(),
+    for the integer heap keys which are not less than the last popped heap key (initially 0).
+    The elements with equal heap keys are popped in an arbitrary order.
+    """
+
+    def __init__(self):
+        self.last = 0  # the last popped heap key
+        self.buckets = [{}]  # buckets[b] maps the key into (heap_key, data) for (heap_key ^ last).bit_length() == b
+        self.register = {}  # maps the key (e.g., vertex) into the number of its bucket
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _insert(self, heap_key, key, data):
+        b = (heap_key ^ self.last).bit_length()
+        while len(self.buckets) <= b:
+            self.buckets.append({})
+        self.buckets[b][key] = (heap_key, data)
+        self.register[key] = b
+
+    def _check(self, heap_key):
+        if heap_key < self.last:
+            raise ValueError('heap_key=%r is less than the last popped heap key %r' % (heap_key, self.last))
+
+    def push(self, heap_key, key, data):
+        """
+        Create a new heap element, O(1) time.
+        :param heap_key:    when used in dijkstra, this is the weight of the edge ending with the vertex
+        :param key:         when used in dijkstra, this is the end vertex of the edge
+        :param data:        this parameter is not used in dijkstra
+        """
+        self._check(heap_key)
+        self._insert(heap_key, key, data)
+        self.size += 1
+
+    def pop(self):
+        """
+        Pop the head of the heap, O(log(C)) amortized time.
+        :return:    the head of the heap, i.e., the element with the minimal heap_key, as a HeapElement
+        """
+        if not self.size:
+            raise IndexError('pop from an empty heap')
+        buckets = self.buckets
+        if not buckets[0]:
+            b = 1
+            while not buckets[b]:
+                b += 1
+            bucket, buckets[b] = buckets[b], {}
+            self.last = min(heap_key for heap_key, _ in bucket.values())
+            for key, (heap_key, data) in bucket.items():
+                self._insert(heap_key, key, data)
+        key, (heap_key, data) = buckets[0].popitem()
+        del self.register[key]
+        self.size -= 1
+        return HeapElement(heap_key, key, data)
+
+    def decrease(self, new_heap_key, key, data):
+        """
+        If no element with the key present in the heap, create it.
+        Otherwise, *assume* that the new_heap_key is not greater than the heap_key for the key,
+        and relocate the element into the bucket of new_heap_key, O(1) time.
+        """
+        b = self.register.get(key)
+        if b is None:
+            self.push(new_heap_key, key, data)
+            return
+        self._check(new_heap_key)
+        del self.buckets[b][key]
+        self._insert(new_heap_key, key, data)
+
+    def update(self, new_heap_key, key, data):
+        """
+        Assume that the given key *exists* in the heap, replace its heap_key with new_heap_key, which can be
+        either less or greater than the old one, but not less than the last popped heap key, O(1) time.
+        """
+        b = self.register[key]
+        self._check(new_heap_key)
+        del self.buckets[b][key]
+        self._insert(new_heap_key, key, data)
@@ -0,0 +1,139 @@
+"""
+Sparse Table for Range Minimum/Maximum Queries in O(1) time over a static array.
+
+When the array never changes after it is loaded, the O(log(n)) queries of the trees in full_bin_tree_for_rmq module
+can be replaced by O(1) queries at the price of O(n*log(n)) time and space for the construction.
+The k-th level of the table keeps, for every i, the index of the min (or max) of the 2**k elements starting at i.
+Any range [i, j] is covered by the two (overlapping) blocks of the size 2**k, where k = floor(log2(j - i + 1)),
+which is enough because min and max are idempotent: min(x, x) == x.
+
+Since the table keeps the indexes of the elements, both the values (query) and the indexes (arg_query) of the
+range min/max are available, ties are broken toward the leftmost index.
+
+To find the range minimum, the range maximum and their indexes for a given array a and range [i, j]:
+st = SparseTable(a)
+st.query(i, j), st.arg_query(i, j)
+st = SparseTable(a, f=max)
+st.query(i, j), st.arg_query(i, j)
+
+Optionally, with dtype given, e.g., SparseTable(a, dtype='float64'), the table is kept in NumPy arrays and built with
+O(log(n)) vectorized operations; query_many() and arg_query_many() answer the whole batch of ranges at once.
+
+Reference:
+https://cp-algorithms.com/data_structures/sparse-table.html
+"""
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, it is required only for the array-backed storage
+    np = None
+
+
+class SparseTable(object):
+    """
+    table[k][i] is the index of the leftmost min (max) of a[i:i + 2**k], for i in range(n - 2**k + 1).
+    The construction takes O(n*log(n)) time and space, a query takes O(1) time.
+    """
+
+    def __init__(self, a, f=min, dtype=None):
+        """
+        :param a:       the original (static) array
+        :param f:       min or max
+        :param dtype:   None to keep the table in Python lists, or a NumPy dtype of the elements, e.g., 'float64',
+                        to keep it in NumPy arrays
+        """
+        if f is not min and f is not max:
+            raise ValueError('f has to be either min or max')
+        self.f = f
+        self.dtype = dtype
+        self.n = n = len(a)
+        self.log = [0] * (n + 1)  # log[m] = floor(log2(m))
+        for m in range(2, n + 1):
+            self.log[m] = self.log[m >> 1] + 1
+        if dtype is not None:
+            if np is None:
+                raise ImportError('numpy is required for the array-backed storage')
+            self._build_array(a)
+        else:
+            self._build_list(a)
+
+    def _build_list(self, a):
+        self.a = a = list(a)
+        better = (lambda x, y: a[x] <= a[y]) if self.f is min else (lambda x, y: a[x] >= a[y])
+        row = list(range(self.n))
+        self.table = [row]
+        half = 1
+        while 2 * half <= self.n:
+            row = [x if better(x, y) else y for x, y in zip(row, row[half:])]
+            self.table.append(row)
+            half <<= 1
+
+    def _build_array(self, a):
+        """
+        The same construction with one vectorized operation per level;
+        the levels are kept as the rows of a 2D array, the unused tails of the rows are filled with 0
+        """
+        self.a = a = np.asarray(a, dtype=self.dtype)
+        n = self.n
+        better = np.less_equal if self.f is min else np.greater_equal
+        table = np.zeros((self.log[n] + 1 if n else 1, n), dtype=np.intp)
+        table[0] = np.arange(n)
+        half, k = 1, 1
+        while 2 * half <= n:
+            m = n - 2 * half + 1
+            x, y = table[k - 1, :m], table[k - 1, half:half + m]
+            table[k, :m] = np.where(better(a[x], a[y]), x, y)
+            half <<= 1
+            k += 1
+        self.table = table
+        self._log_arr = np.asarray(self.log, dtype=np.intp)
+
+    def __len__(self):
+        return self.n
+
+    def arg_query(self, q_st, q_end):
+        """
+        :param q_st:    starting position of the query range
+        :param q_end:   ending position of the query range
+        :return:        the leftmost index of the min (max) of the elements with the indexes in [q_st, q_end]
+        """
+        if q_st < 0 or q_end > self.n - 1 or q_st > q_end:
+            raise RuntimeError("Invalid range arguments")
+        k = self.log[q_end - q_st + 1]
+        row = self.table[k]
+        x, y = row[q_st], row[q_end - (1 << k) + 1]
+        if self.f is min:
+            return x if self.a[x] <= self.a[y] else y
+        return x if self.a[x] >= self.a[y] else y
+
+    def query(self, q_st, q_end):
+        """
+        :return:    the min (max) of the elements with the indexes in [q_st, q_end] range including both the ends
+        """
+        return self.a[self.arg_query(q_st, q_end)]
+
+    def arg_query_many(self, starts, ends):
+        """
+        Batch version of arg_query(), O(1) vectorized operations for the NumPy storage
+        :param starts:  a sequence (or a NumPy array) of the starting positions of the query ranges
+        :param ends:    a sequence (or a NumPy array) of the ending positions of the query ranges
+        :return:        a NumPy array (a list for the list storage) of the indexes of the min (max) of the ranges
+        """
+        if self.dtype is None:
+            return [self.arg_query(i, j) for i, j in zip(starts, ends)]
+        starts, ends = np.asarray(starts, dtype=np.intp), np.asarray(ends, dtype=np.intp)
+        if len(starts) and (starts.min() < 0 or ends.max() > self.n - 1 or (starts > ends).any()):
+            raise RuntimeError("Invalid range arguments")
+        k = self._log_arr[ends - starts + 1]
+        x, y = self.table[k, starts], self.table[k, ends - (1 << k) + 1]
+        better = np.less_equal if self.f is min else np.greater_equal
+        return np.where(better(self.a[x], self.a[y]), x, y)
+
+    def query_many(self, starts, ends):
+        """
+        Batch version of query()
+        :return:    a NumPy array (a list for the list storage) of the min (max) of the ranges
+        """
+        if self.dtype is None:
+            return [self.query(i, j) for i, j in zip(starts, ends)]
+        return self.a[self.arg_query_many(starts, ends)]
@@ -0,0 +1,289 @@
+"""
+Priority queues with reprioritisation for the producer/consumer code, built on UpdatableHeap from
+heap_with_update module: UpdatablePriorityQueue for the threads and AsyncUpdatablePriorityQueue for asyncio.
+
+Both have the interface of the standard queue.Queue (asyncio.Queue), where an item is (heap_key, key, data),
+the element with the minimal heap_key is taken first, and an item can be reprioritised or removed by its key:
+q = UpdatablePriorityQueue(maxsize=100)    # maxsize=0 for an unbounded queue
+q.put(heap_key, key, data)                  # blocks while the queue is full; an existing key is reprioritised
+q.put_many([(heap_key, key, data), ...])    # all the items under one acquisition of the lock
+q.reprioritise(new_heap_key, key)           # either a decrease or an increase of the heap_key
+q.remove(key)                               # cancel the item
+el = q.get()                                # blocks while the queue is empty, el is a HeapElement
+els = q.get_many(10)                        # up to 10 items, blocks only while the queue is empty
+
+The thread-safe queue holds one lock, only for the O(log(n)) heap operations themselves, the waiting is done
+on two conditions sharing the lock, as in queue.Queue.  The asyncio queue keeps the futures of the waiting
+coroutines, as asyncio.Queue does: a put() of a new item, which is necessarily the new minimum of an empty queue,
+wakes one waiting get(), there is no polling.  The asyncio queue requires Python 3.5.2 or newer.
+"""
+
+import asyncio
+import threading
+from collections import deque
+from queue import Empty, Full
+from time import monotonic
+
+from exoticst.heap_with_update import UpdatableHeap
+
+
+class UpdatablePriorityQueue(object):
+    """
+    Thread-safe priority queue with reprioritisation, the exceptions are queue.Empty and queue.Full
+    """
+
+    def __init__(self, maxsize=0, arity=2):
+        """
+        :param maxsize: the maximal number of the items, put() blocks when it is reached; 0 for an unbounded queue
+        :param arity:   the arity of the underlying UpdatableHeap
+        """
+        self.maxsize = maxsize
+        self.heap = UpdatableHeap(arity=arity)
+        self.mutex = threading.Lock()
+        self.not_empty = threading.Condition(self.mutex)
+        self.not_full = threading.Condition(self.mutex)
+
+    def qsize(self):
+        with self.mutex:
+            return len(self.heap)
+
+    __len__ = qsize
+
+    def empty(self):
+        return not self.qsize()
+
+    def full(self):
+        with self.mutex:
+            return self._full()
+
+    def __contains__(self, key):
+        with self.mutex:
+            return key in self.heap
+
+    def _full(self):
+        return 0 < self.maxsize <= len(self.heap)
+
+    @staticmethod
+    def _wait(condition, predicate, block, endtime, exc):
+        """
+        Wait on the condition (its lock is held) until the predicate holds, raise exc if it does not in time
+        """
+        if not block:
+            if not predicate():
+                raise exc
+        elif not condition.wait_for(predicate, None if endtime is None else max(0.0, endtime - monotonic())):
+            raise exc
+
+    def _put(self, heap_key, key, data, block, endtime):
+        if key not in self.heap:
+            self._wait(self.not_full, lambda: key in self.heap or not self._full(), block, endtime, Full)
+        if key in self.heap:
+            self.heap.update(heap_key, key, data)
+        else:
+            self.heap.push(heap_key, key, data)
+            self.not_empty.notify()
+
+    def put(self, heap_key, key, data=None, block=True, timeout=None):
+        """
+        Put the item into the queue; if the key is already in the queue, reprioritise it instead, without blocking.
+        :param block:   if False, raise queue.Full at once when the queue is full
+        :param timeout: None to wait as long as needed, or the maximal waiting time in seconds
+        """
+        with self.mutex:
+            self._put(heap_key, key, data, block, None if timeout is None else monotonic() + timeout)
+
+    def put_many(self, items, block=True, timeout=None):
+        """
+        Put the items (heap_key, key, data) in the given order under one acquisition of the lock, see put().
+        The timeout is for all the items together; if queue.Full is raised, the items before it are in the queue.
+        """
+        endtime = None if timeout is None else monotonic() + timeout
+        with self.mutex:
+            for heap_key, key, data in items:
+                self._put(heap_key, key, data, block, endtime)
+
+    def get(self, block=True, timeout=None):
+        """
+        Remove and return the item with the minimal heap_key as a HeapElement.
+        :param block:   if False, raise queue.Empty at once when the queue is empty
+        :param timeout: None to wait as long as needed, or the maximal waiting time in seconds
+        """
+        return self.get_many(1, block, timeout)[0]
+
+    def get_many(self, n, block=True, timeout=None):
+        """
+        Remove and return up to n items with the minimal heap keys in the sorted order, under one acquisition of
+        the lock; wait (see get()) only while the queue is empty.
+        """
+        with self.mutex:
+            self._wait(self.not_empty, lambda: len(self.heap), block,
+                       None if timeout is None else monotonic() + timeout, Empty)
+            result = [self.heap.pop() for _ in range(min(n, len(self.heap)))]
+            self.not_full.notify(len(result))
+            return result
+
+    def peek(self):
+        """
+        :return:    the item with the minimal heap_key, without removing it; raise queue.Empty if there is none
+        """
+        with self.mutex:
+            if not len(self.heap):
+                raise Empty
+            return self.heap.peek()
+
+    def reprioritise(self, new_heap_key, key, data=None):
+        """
+        Replace the heap_key of the item with the key, which *exists* in the queue, KeyError otherwise
+        """
+        with self.mutex:
+            self.heap.update(new_heap_key, key, data)
+
+    def remove(self, key):
+        """
+        Remove the item with the key, which *exists* in the queue, KeyError otherwise
+        :return:    the removed item
+        """
+        with self.mutex:
+            result_el = self.heap.remove(key)
+            self.not_full.notify()
+            return result_el
+
+
+class AsyncUpdatablePriorityQueue(object):
+    """
+    The asyncio counterpart of UpdatablePriorityQueue, the exceptions are asyncio.QueueEmpty and asyncio.QueueFull.
+    It is not thread-safe, all the methods have to be called from the thread of the event loop.
+    """
+
+    def __init__(self, maxsize=0, arity=2):
+        """
+        :param maxsize: the maximal number of the items, put() waits when it is reached; 0 for an unbounded queue
+        :param arity:   the arity of the underlying UpdatableHeap
+        """
+        self.maxsize = maxsize
+        self.heap = UpdatableHeap(arity=arity)
+        self._getters = deque()  # the futures of the coroutines waiting for an item
+        self._putters = deque()  # the futures of the coroutines waiting for a free slot
+
+    def qsize(self):
+        return len(self.heap)
+
+    __len__ = qsize
+
+    def empty(self):
+        return not len(self.heap)
+
+    def full(self):
+        return 0 < self.maxsize <= len(self.heap)
+
+    def __contains__(self, key):
+        return key in self.heap
+
+    @staticmethod
+    def _wakeup_next(waiters):
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    async def _wait(self, waiters, predicate):
+        """
+        Wait on a new future in waiters until the predicate holds
+        """
+        while not predicate():
+            waiter = asyncio.get_event_loop().create_future()  # the running loop, when called from a coroutine
+            waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                waiter.cancel()
+                try:
+                    waiters.remove(waiter)
+                except ValueError:
+                    pass
+                if predicate() and not waiter.cancelled():
+                    self._wakeup_next(waiters)  # pass the wakeup to the next waiting coroutine
+                raise
+
+    def put_nowait(self, heap_key, key, data=None):
+        """
+        Put the item into the queue, or reprioritise it if the key is already in the queue;
+        raise asyncio.QueueFull if the queue is full
+        """
+        if key in self.heap:
+            self.heap.update(heap_key, key, data)
+            return
+        if self.full():
+            raise asyncio.QueueFull
+        self.heap.push(heap_key, key, data)
+        self._wakeup_next(self._getters)
+
+    async def put(self, heap_key, key, data=None):
+        """
+        Put the item into the queue, wait while it is full; if the key is already in the queue, reprioritise it
+        """
+        await self._wait(self._putters, lambda: key in self.heap or not self.full())
+        self.put_nowait(heap_key, key, data)
+
+    async def put_many(self, items):
+        """
+        Put the items (heap_key, key, data) in the given order, see put()
+        """
+        for heap_key, key, data in items:
+            await self.put(heap_key, key, data)
+
+    def get_nowait(self):
+        """
+        Remove and return the item with the minimal heap_key; raise asyncio.QueueEmpty if the queue is empty
+        """
+        return self.get_many_nowait(1)[0]
+
+    async def get(self):
+        """
+        Remove and return the item with the minimal heap_key as a HeapElement, wait while the queue is empty
+        """
+        await self._wait(self._getters, lambda: len(self.heap))
+        return self.get_nowait()
+
+    def get_many_nowait(self, n):
+        """
+        Remove and return up to n items with the minimal heap keys in the sorted order;
+        raise asyncio.QueueEmpty if the queue is empty
+        """
+        if not len(self.heap):
+            raise asyncio.QueueEmpty
+        result = [self.heap.pop() for _ in range(min(n, len(self.heap)))]
+        for _ in result:
+            self._wakeup_next(self._putters)
+        return result
+
+    async def get_many(self, n):
+        """
+        Remove and return up to n items with the minimal heap keys in the sorted order, wait while the queue is empty
+        """
+        await self._wait(self._getters, lambda: len(self.heap))
+        return self.get_many_nowait(n)
+
+    def peek(self):
+        """
+        :return:    the item with the minimal heap_key, without removing it; raise asyncio.QueueEmpty if there is none
+        """
+        if not len(self.heap):
+            raise asyncio.QueueEmpty
+        return self.heap.peek()
+
+    def reprioritise(self, new_heap_key, key, data=None):
+        """
+        Replace the heap_key of the item with the key, which *exists* in the queue, KeyError otherwise
+        """
+        self.heap.update(new_heap_key, key, data)
+
+    def remove(self, key):
+        """
+        Remove the item with the key, which *exists* in the queue, KeyError otherwise
+        :return:    the removed item
+        """
+        result_el = self.heap.remove(key)
+        self._wakeup_next(self._putters)
+        return result_el
@@ -0,0 +1,164 @@
+"""
+Wavelet Matrix for "k-th smallest value in a[i..j]" and "how many values in a[i..j] are less than x" queries
+over a static array in O(log(sigma)) time, where sigma is the number of the distinct values in the array.
+
+The values are replaced with their ranks (codes) among the sorted distinct values, so every code has
+L = ceil(log2(sigma)) bits.  The level l of the matrix is a bit vector with the l-th highest bit of every code,
+taken in the order in which the codes come out of the previous level, after a stable partition by the previous bit:
+all the codes with 0 first, then all the codes with 1.  A range [i, j] of a level maps into two ranges of the next
+level, and the number of the 1-s before a position (rank) tells where exactly.
+
+The bit vectors are packed into 64-bit words, array('Q'), and for every word the number of the 1-s before it is kept,
+so a rank takes O(1) time and the whole structure takes about 1.5*n*L bits, plus the sorted distinct values.
+
+For a given array a:
+wm = WaveletMatrix(a)                       # or WaveletMatrix(a, dtype='int64') to build it with NumPy
+wm.kth_smallest(i, j, k)                    # the k-th smallest value, k = 1, 2, ..., j - i + 1, in a[i..j]
+wm.count_less(i, j, x)                      # the number of the values less than x in a[i..j]
+
+Reference:
+F. Claude, G. Navarro, A. Ordonez, The wavelet matrix: An efficient wavelet tree for large alphabets
+"""
+
+from array import array
+from bisect import bisect_left
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, it is required only for the vectorized construction
+    np = None
+
+
+def _popcount(x):
+    return bin(x).count('1')
+
+
+class WaveletMatrix(object):
+    """
+    The construction takes O(n*log(sigma)) time, the queries take O(log(sigma)) time.
+    """
+
+    def __init__(self, a, dtype=None):
+        """
+        :param a:       the original (static) array of comparable values (integers for the NumPy construction)
+        :param dtype:   None to build the matrix in pure Python, or a NumPy dtype of the values, e.g., 'int64',
+                        to build it with O(log(sigma)) vectorized NumPy operations
+        """
+        self.n = n = len(a)
+        self.rank_typecode = 'I' if n < 2 ** 32 else 'Q'
+        self.words = []  # per level: the bit vector packed into the 64-bit words, with one extra word at the end
+        self.ranks = []  # per level: the number of the 1-s before each word
+        self.zeros = []  # per level: the number of the 0-s, i.e., where the codes with the bit 1 start on next level
+        if dtype is not None:
+            if np is None:
+                raise ImportError('numpy is required for the vectorized construction')
+            self._build_array(np.asarray(a, dtype=dtype))
+        else:
+            self._build_list(a)
+
+    def _build_list(self, a):
+        self.values = sorted(set(a))
+        self.height = max(1, (len(self.values) - 1).bit_length())
+        code_of = {x: c for c, x in enumerate(self.values)}
+        codes = [code_of[x] for x in a]
+        n_words = (self.n >> 6) + 1
+        for shift in range(self.height - 1, -1, -1):
+            words = array('Q', [0]) * n_words
+            zeros, ones = [], []
+            for i, c in enumerate(codes):
+                if (c >> shift) & 1:
+                    words[i >> 6] |= 1 << (i & 63)
+                    ones.append(c)
+                else:
+                    zeros.append(c)
+            ranks = array(self.rank_typecode, [0]) * n_words
+            for w in range(1, n_words):
+                ranks[w] = ranks[w - 1] + _popcount(words[w - 1])
+            self.words.append(words)
+            self.ranks.append(ranks)
+            self.zeros.append(len(zeros))
+            codes = zeros + ones
+
+    def _build_array(self, a):
+        values = np.unique(a)
+        self.values = values.tolist()
+        self.height = max(1, (len(self.values) - 1).bit_length())
+        codes = np.searchsorted(values, a)
+        n_words = (self.n >> 6) + 1
+        rank_dtype = np.uint32 if self.rank_typecode == 'I' else np.uint64
+        # packbits() puts the first bit into the highest bit of a byte, the words need it in the lowest one;
+        # packbits(bitorder='little') does it at once, but requires numpy 1.17
+        reversed_bits = np.array([int('{:08b}'.format(x)[::-1], 2) for x in range(256)], dtype=np.uint8)
+        for shift in range(self.height - 1, -1, -1):
+            bits = ((codes >> shift) & 1).astype(np.uint8)
+            packed = np.zeros(n_words * 8, dtype=np.uint8)
+            packed_bits = reversed_bits[np.packbits(bits)]
+            packed[:len(packed_bits)] = packed_bits
+            cum_ones = np.concatenate((np.zeros(1, dtype=np.int64), np.cumsum(bits, dtype=np.int64)))
+            ranks = cum_ones[np.arange(n_words) * 64]
+            self.words.append(array('Q', packed.view('<u8').astype(np.uint64).tobytes()))
+            self.ranks.append(array(self.rank_typecode, ranks.astype(rank_dtype).tobytes()))
+            is_one = bits.astype(bool)
+            self.zeros.append(int(self.n - cum_ones[-1]))
+            codes = np.concatenate((codes[~is_one], codes[is_one]))
+
+    def __len__(self):
+        return self.n
+
+    def _rank1(self, level, i):
+        """
+        :return:    the number of the 1-s among the first i bits of the level
+        """
+        w = i >> 6
+        return self.ranks[level][w] + _popcount(self.words[level][w] & ((1 << (i & 63)) - 1))
+
+    def _check_range(self, q_st, q_end):
+        if q_st < 0 or q_end > self.n - 1 or q_st > q_end:
+            raise RuntimeError("Invalid range arguments")
+
+    def kth_smallest(self, q_st, q_end, k):
+        """
+        :param q_st:    starting position of the query range
+        :param q_end:   ending position of the query range
+        :param k:       the rank of the value, starting from 1
+        :return:        the k-th smallest value among the elements with the indexes in [q_st, q_end]
+        """
+        self._check_range(q_st, q_end)
+        if not (1 <= k <= q_end - q_st + 1):
+            raise RuntimeError('k=%r is out of range' % (k,))
+        k -= 1
+        lo, hi = q_st, q_end + 1
+        code = 0
+        for level in range(self.height):
+            ones_lo, ones_hi = self._rank1(level, lo), self._rank1(level, hi)
+            zeros = (hi - lo) - (ones_hi - ones_lo)
+            code <<= 1
+            if k < zeros:
+                lo, hi = lo - ones_lo, hi - ones_hi
+            else:
+                k -= zeros
+                code |= 1
+                lo, hi = self.zeros[level] + ones_lo, self.zeros[level] + ones_hi
+        return self.values[code]
+
+    def count_less(self, q_st, q_end, x):
+        """
+        :param q_st:    starting position of the query range
+        :param q_end:   ending position of the query range
+        :param x:       any value comparable with the elements
+        :return:        the number of the elements with the indexes in [q_st, q_end] which are less than x
+        """
+        self._check_range(q_st, q_end)
+        code = bisect_left(self.values, x)  # the number of the distinct values less than x
+        lo, hi = q_st, q_end + 1
+        if code >= len(self.values):
+            return hi - lo
+        count = 0
+        for level in range(self.height):
+            ones_lo, ones_hi = self._rank1(level, lo), self._rank1(level, hi)
+            if (code >> (self.height - 1 - level)) & 1:
+                count += (hi - lo) - (ones_hi - ones_lo)
+                lo, hi = self.zeros[level] + ones_lo, self.zeros[level] + ones_hi
+            else:
+                lo, hi = lo - ones_lo, hi - ones_hi
+        return count
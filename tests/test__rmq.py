@@ -1,5 +1,14 @@
-from unittest import TestCase
-from exoticst.full_bin_tree_for_rmq import build_helper_tree, rmq, update
+import operator
+from array import array
+from random import Random
+from unittest import TestCase, skipIf
+from exoticst.full_bin_tree_for_rmq import (ArgSegmentTree, LazySegmentTree, SegmentTree, build_helper_tree, rmq, rmq_many,
+                                          set_value, update, _same_layout)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 ################### test helper functions ############################################
@@ -45,6 +54,10 @@ class TestRmq(TestCase):
     def test__build_helper_tree_sum_1(self):
         self.assertEqual([12, 5, 7], build_helper_tree([5, 7], f=sum, ignore=0))
 
+    def test__build_helper_tree_empty(self):
+        self.assertEqual([], build_helper_tree([]))
+        self.assertRaises(RuntimeError, rmq, 0, [], 0, 0)
+
     def test__build_helper_tree_sum_2(self):
         self.assertEqual([22, 12, 10, 5, 7, 0, 0], build_helper_tree([5, 7, 10], f=sum, ignore=0))
 
@@ -189,3 +202,233 @@ class TestRmq(TestCase):
             self.assertEqual(t2, t3)
 
     ##################################################################################
+
+    def test_set_value(self):
+        for f, ignore in ((min, float('inf')), (max, -float('inf')), (sum, 0)):
+            for n in range(1, 9):
+                a = [5, 3, 7, 4, 8, 1, 9, 2][:n]
+                t = build_helper_tree(a, f=f, ignore=ignore)
+                for j in range(n):
+                    for x in (a[j] + 10, a[j] - 10):
+                        a[j] = x
+                        t = set_value(n, t, idx_change=j, value=x, f=f, ignore=ignore)
+                        self.assertEqual(build_helper_tree(a, f=f, ignore=ignore), t)
+        self.assertRaises(IndexError, set_value, 1, [5], 1, 3)
+
+    ##################################################################################
+
+
+class TestSegmentTree(TestCase):
+    a = [5, 3, 7, 4, 8, 1, 9, 2, 6]
+
+    def _check_all_queries(self, a, t, f):
+        for j in range(len(a)):
+            for i in range(j + 1):
+                self.assertEqual(f(a[i:j + 1]), t.query(i, j))
+
+    def test_min_max_sum_queries(self):
+        for n in range(1, len(self.a) + 1):
+            a = self.a[:n]
+            self._check_all_queries(a, SegmentTree(a), min)
+            self._check_all_queries(a, SegmentTree(a, op=max, identity=-float('inf')), max)
+            self._check_all_queries(a, SegmentTree(a, op=operator.add, identity=0), sum)
+            self._check_all_queries(a, SegmentTree(a, op=sum, identity=0), sum)
+
+    def test_typed_storage(self):
+        for n in range(0, len(self.a) + 1):
+            a = self.a[:n]
+            for typecode, data in (('d', array('d', a)), ('q', array('q', a)), ('q', memoryview(array('q', a))),
+                                   ('d', a)):
+                for op, identity, f in ((min, float('inf'), min), (operator.add, 0, sum)):
+                    t = SegmentTree(data, op=op, identity=identity, typecode=typecode)
+                    self.assertEqual(typecode, t.t.typecode)
+                    self.assertEqual(2 * n, len(t.t))
+                    self.assertEqual(SegmentTree(a, op=op, identity=identity).t[1:], t.t.tolist()[1:])
+                    self._check_all_queries(a, t, f)
+        t = SegmentTree(array('q', self.a), typecode='q')
+        t.set_value(3, 100)
+        self.assertEqual(100, t.element(3))
+
+    def test_typed_storage_mismatched_formats(self):
+        a = self.a
+        for typecode, data in (('q', array('i', a)), ('d', array('f', a)), ('d', array('q', a)),
+                               ('q', memoryview(array('h', a))), ('d', memoryview(array('b', a)))):
+            t = SegmentTree(data, typecode=typecode)
+            self.assertEqual(typecode, t.t.typecode)
+            self.assertEqual(SegmentTree(a).t[1:], t.t.tolist()[1:])
+            self._check_all_queries(a, t, min)
+        self.assertRaises(TypeError, SegmentTree, array('d', [0.5, 1.5]), typecode='q')
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_typed_storage_numpy_input(self):
+        a = self.a
+        self.assertTrue(_same_layout(memoryview(np.array(a, dtype=np.int64)), 'q', 8))
+        self.assertFalse(_same_layout(memoryview(np.array(a, dtype=np.int32)), 'q', 8))
+        self.assertFalse(_same_layout(memoryview(np.array(a, dtype=np.float64)), 'q', 8))
+        for typecode, dtype in (('q', np.int64), ('q', np.int32), ('d', np.float32), ('d', np.int64)):
+            t = SegmentTree(np.array(a, dtype=dtype), typecode=typecode)
+            self.assertEqual(SegmentTree(a).t[1:], t.t.tolist()[1:])
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_numpy_storage(self):
+        for n in range(0, len(self.a) + 1):
+            a = self.a[:n]
+            for op, identity, f in ((min, float('inf'), min), (max, -float('inf'), max), (operator.add, 0, sum),
+                                    (lambda x, y: x + y, 0, sum)):
+                t = SegmentTree(np.array(a), op=op, identity=identity, dtype='int64')
+                self.assertEqual(2 * n, len(t.t))
+                self.assertEqual(SegmentTree(a, op=op, identity=identity).t[1:], t.t.tolist()[1:])
+                self._check_all_queries(a, t, f)
+                if n:
+                    starts, ends = zip(*[(i, j) for j in range(n) for i in range(j + 1)])
+                    self.assertEqual([f(a[i:j + 1]) for i, j in zip(starts, ends)], list(rmq_many(t, starts, ends)))
+
+    def test_non_commutative_op(self):
+        a = ['a', 'b', 'c', 'd', 'e', 'f', 'g']
+        t = SegmentTree(a, op=operator.add, identity='')
+        self._check_all_queries(a, t, ''.join)
+
+    def test_set_value(self):
+        for op, identity, f in ((min, float('inf'), min), (max, -float('inf'), max), (operator.add, 0, sum)):
+            a = self.a[:]
+            t = SegmentTree(a, op=op, identity=identity)
+            for j in range(len(a)):
+                for x in (a[j] + 10, a[j] - 10):
+                    a[j] = x
+                    t.set_value(j, x)
+                    self.assertEqual(SegmentTree(a, op=op, identity=identity).t, t.t)
+            self._check_all_queries(a, t, f)
+
+    def test_max_right_and_min_left(self):
+        for n in range(0, len(self.a) + 1):
+            a = self.a[:n]
+            t = SegmentTree(a, op=operator.add, identity=0)
+            for k in range(1, sum(a) + 2):
+                g = (lambda s: s < k)
+                for i in range(n + 1):
+                    self.assertEqual(max(r for r in range(i, n + 1) if g(sum(a[i:r]))), t.max_right(i, g))
+                    self.assertEqual(min(lo for lo in range(i + 1) if g(sum(a[lo:i]))), t.min_left(i, g))
+
+    def test_find_first_and_find_last(self):
+        for n in range(0, len(self.a) + 1):
+            a = self.a[:n]
+            t = SegmentTree(a)
+            for x in range(0, 11):
+                pred = (lambda v: v < x)
+                for i in range(n + 1):
+                    self.assertEqual(next((j for j in range(i, n) if pred(a[j])), -1), t.find_first(i, pred))
+                    self.assertEqual(next((j for j in range(i - 1, -1, -1) if pred(a[j])), -1),
+                                     t.find_last(i - 1, pred))
+
+    def test_rmq_many(self):
+        starts, ends = zip(*[(i, j) for j in range(len(self.a)) for i in range(j + 1)])
+        for op, identity, f in ((min, float('inf'), min), (max, -float('inf'), max), (operator.add, 0, sum),
+                                (lambda x, y: x + y, 0, sum)):
+            t = SegmentTree(self.a, op=op, identity=identity)
+            realised = rmq_many(t, starts, ends)
+            self.assertEqual([f(self.a[i:j + 1]) for i, j in zip(starts, ends)], list(realised))
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_rmq_many_numpy(self):
+        t = SegmentTree(self.a, op=operator.add, identity=0)
+        realised = rmq_many(t, np.array([0, 2, 8]), np.array([8, 2, 8]))
+        self.assertEqual([sum(self.a), self.a[2], self.a[8]], realised.tolist())
+        self.assertEqual(0, len(rmq_many(t, [], [])))
+        self.assertRaises(RuntimeError, rmq_many, t, [3], [2])
+        self.assertRaises(RuntimeError, rmq_many, t, [0], [len(self.a)])
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_rmq_many_large_int64(self):
+        a = [2 ** 60 + 5, 2 ** 60 + 1, 2 ** 60 + 3, 2 ** 62 + 7]
+        starts, ends = [0, 1, 2, 0, 3], [3, 2, 2, 0, 3]
+        for op, identity, f in ((min, float('inf'), min), (max, -float('inf'), max)):
+            for kwargs in ({}, {'typecode': 'q'}, {'dtype': 'int64'}):
+                t = SegmentTree(a, op=op, identity=identity, **kwargs)
+                realised = rmq_many(t, starts, ends)
+                self.assertEqual(np.int64, realised.dtype)
+                self.assertEqual([t.query(i, j) for i, j in zip(starts, ends)], realised.tolist())
+                self.assertEqual([f(a[i:j + 1]) for i, j in zip(starts, ends)], realised.tolist())
+
+    def test_invalid_range(self):
+        t = SegmentTree(self.a)
+        self.assertRaises(RuntimeError, t.query, -1, 2)
+        self.assertRaises(RuntimeError, t.query, 3, 2)
+        self.assertRaises(RuntimeError, t.query, 0, len(self.a))
+        self.assertRaises(IndexError, t.update, len(self.a), 1)
+
+    def test_update(self):
+        a, b = self.a[:], self.a[:]
+        t_min = SegmentTree(a)
+        t_sum = SegmentTree(b, op=operator.add, identity=0)
+        rnd = Random(7)
+        for _ in range(20):
+            j, x = rnd.randrange(len(a)), rnd.randrange(-10, 10)
+            t_min.update(j, a[j] + x)
+            a[j] = min(a[j], a[j] + x)
+            t_sum.update(j, x)
+            b[j] += x
+            self.assertEqual(a, [t_min.element(k) for k in range(len(a))])
+        self._check_all_queries(a, t_min, min)
+        self._check_all_queries(b, t_sum, sum)
+
+
+class TestLazySegmentTree(TestCase):
+    def test_random_range_updates(self):
+        rnd = Random(11)
+        for f in (min, max, sum):
+            for n in (1, 2, 5, 8, 13):
+                a = [rnd.randrange(-20, 20) for _ in range(n)]
+                t = LazySegmentTree(a, f=f)
+                for _ in range(60):
+                    i = rnd.randrange(n)
+                    j = rnd.randrange(i, n)
+                    x = rnd.randrange(-10, 10)
+                    if rnd.random() < 0.5:
+                        t.add_range(i, j, x)
+                        a[i:j + 1] = [y + x for y in a[i:j + 1]]
+                    else:
+                        t.assign_range(i, j, x)
+                        a[i:j + 1] = [x] * (j + 1 - i)
+                    i = rnd.randrange(n)
+                    j = rnd.randrange(i, n)
+                    self.assertEqual(f(a[i:j + 1]), t.query(i, j))
+                self.assertEqual(a, [t.element(k) for k in range(n)])
+
+    def test_invalid_arguments(self):
+        t = LazySegmentTree([1, 2, 3], f=sum)
+        self.assertRaises(RuntimeError, t.add_range, 2, 1, 1)
+        self.assertRaises(RuntimeError, t.query, 0, 3)
+        self.assertRaises(ValueError, LazySegmentTree, [1, 2, 3], f=len)
+
+
+class TestArgSegmentTree(TestCase):
+    a = [5, 3, 7, 3, 8, 1, 9, 1, 6, 9, 2]
+
+    def _check_all_queries(self, a, t, f):
+        for j in range(len(a)):
+            for i in range(j + 1):
+                self.assertEqual(a.index(f(a[i:j + 1]), i), t.arg_query(i, j))
+                self.assertEqual(f(a[i:j + 1]), t.query(i, j))
+
+    def test_argmin_and_argmax(self):
+        for n in range(1, len(self.a) + 1):
+            a = self.a[:n]
+            self._check_all_queries(a, ArgSegmentTree(a), min)
+            self._check_all_queries(a, ArgSegmentTree(a, f=max), max)
+
+    def test_set_value(self):
+        rnd = Random(5)
+        for f in (min, max):
+            a = self.a[:]
+            t = ArgSegmentTree(a, f=f)
+            for _ in range(30):
+                j, x = rnd.randrange(len(a)), rnd.randrange(0, 6)
+                a[j] = x
+                t.set_value(j, x)
+            self._check_all_queries(a, t, f)
+
+    def test_invalid_arguments(self):
+        t = ArgSegmentTree(self.a)
+        self.assertRaises(RuntimeError, t.arg_query, 3, 2)
+        self.assertRaises(IndexError, t.set_value, len(self.a), 0)
+        self.assertRaises(ValueError, ArgSegmentTree, self.a, f=sum)
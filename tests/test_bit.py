@@ -1,5 +1,12 @@
-from unittest import TestCase
-from exoticst.bit import Bit, BITError
+import os
+from tempfile import mkdtemp
+from unittest import TestCase, skipIf
+from exoticst.bit import Bit, Bit2D, BITError, CompressedBit, RangeBit, SparseBit
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class TestBit(TestCase):
@@ -26,3 +33,236 @@ class TestBit(TestCase):
         expected_0_2 = 16
         realised = bit.range_sum(0, 2)
         self.assertEqual(expected_0_2, realised)
+
+    def test_init_with_list_matches_add_at(self):
+        lst = [3, -1, 4, 1, -5, 9, 2, 6, 5, 3, 5]
+        expected = Bit(len(lst))
+        for j, x in enumerate(lst):
+            expected.add_at(j, x)
+        bit = Bit(len(lst))
+        bit.init_with_list(lst)
+        self.assertEqual(expected.tree_lst, bit.tree_lst)
+
+    def test_from_iterable(self):
+        lst = [3, -1, 4, 1, -5, 9, 2, 6, 5, 3, 5, 8, 9, 7, 9, 3, 2]
+        bit = Bit(len(lst))
+        bit.init_with_list(lst)
+        realised = Bit.from_iterable(x for x in lst)
+        self.assertEqual(bit.tree_lst, realised.tree_lst)
+        self.assertEqual(lst, [realised.element(j) for j in range(len(lst))])
+
+    def test_from_iterable_empty(self):
+        self.assertRaises(BITError, Bit.from_iterable, iter([]))
+
+    def test_lower_bound(self):
+        lst = [2, 0, 3, 1, 0, 0, 4, 1, 5]
+        bit = Bit(len(lst))
+        bit.init_with_list(lst)
+        for target_sum in range(-1, sum(lst) + 3):
+            expected = next((j for j in range(len(lst)) if sum(lst[:j + 1]) >= target_sum), len(lst))
+            self.assertEqual(expected, bit.lower_bound(target_sum))
+
+    def test_find_kth(self):
+        counts = [0, 3, 0, 1, 2, 0, 0, 4]
+        bit = Bit(len(counts))
+        bit.init_with_list(counts)
+        items = [j for j, c in enumerate(counts) for _ in range(c)]
+        self.assertEqual(items, [bit.find_kth(k) for k in range(1, len(items) + 1)])
+        self.assertRaises(BITError, bit.find_kth, 0)
+        self.assertRaises(BITError, bit.find_kth, len(items) + 1)
+
+
+@skipIf(np is None, 'numpy is not installed')
+class TestNumpyBit(TestCase):
+    lst = [3, -1, 4, 1, -5, 9, 2, 6, 5, 3, 5, 8, 9, 7, 9, 3, 2]
+
+    def test_init_with_list(self):
+        expected = Bit(len(self.lst))
+        expected.init_with_list(self.lst)
+        bit = Bit(len(self.lst), dtype='int64')
+        bit.init_with_list(self.lst)
+        self.assertEqual(expected.tree_lst, bit.tree_lst.tolist())
+        self.assertEqual(self.lst, [bit.element(j) for j in range(len(self.lst))])
+
+    def test_from_iterable(self):
+        bit = Bit.from_iterable((x for x in self.lst), dtype='float64')
+        self.assertEqual(self.lst, [bit.element(j) for j in range(len(self.lst))])
+        self.assertRaises(BITError, Bit.from_iterable, iter([]), dtype='int64')
+
+    def test_prefix_sum_many(self):
+        bit = Bit(len(self.lst), dtype='int64')
+        bit.init_with_list(self.lst)
+        indices = list(range(len(self.lst))) + [3, 0, 16]
+        self.assertEqual([bit.prefix_sum(j) for j in indices], bit.prefix_sum_many(indices).tolist())
+
+    def test_range_sum_many(self):
+        bit = Bit(len(self.lst), dtype='int64')
+        bit.init_with_list(self.lst)
+        starts, ends = [0, 2, 5, 16], [0, 10, 16, 16]
+        self.assertEqual([sum(self.lst[i:j + 1]) for i, j in zip(starts, ends)],
+                         bit.range_sum_many(starts, ends).tolist())
+
+    def test_add_at_many(self):
+        bit = Bit(len(self.lst), dtype='int64')
+        bit.init_with_list(self.lst)
+        lst_bit = Bit(len(self.lst))
+        lst_bit.init_with_list(self.lst)
+        indices, increments = [0, 4, 4, 16, 7], [10, -3, 5, 1, 2]
+        bit.add_at_many(indices, increments)
+        lst_bit.add_at_many(indices, increments)
+        self.assertEqual(lst_bit.tree_lst, bit.tree_lst.tolist())
+        bit.add_at_many([1, 2], 7)
+        lst_bit.add_at_many([1, 2], 7)
+        self.assertEqual(lst_bit.tree_lst, bit.tree_lst.tolist())
+
+
+@skipIf(np is None, 'numpy is not installed')
+class TestMmapBit(TestCase):
+    lst = [3, -1, 4, 1, -5, 9, 2, 6, 5, 3]
+
+    def setUp(self):
+        self.dir = mkdtemp()
+        self.path = os.path.join(self.dir, 'tree.bit')
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        os.rmdir(self.dir)
+
+    def test_create_and_reopen(self):
+        bit = Bit.create_mmap(self.path, len(self.lst), dtype='int64')
+        bit.init_with_list(self.lst)
+        bit.add_at(3, 10)
+        bit.flush()
+        del bit
+        expected = self.lst[:]
+        expected[3] += 10
+        reader = Bit.open_mmap(self.path)
+        self.assertEqual(expected, [reader.element(j) for j in range(len(self.lst))])
+        self.assertRaises(ValueError, reader.add_at, 0, 1)
+        writer = Bit.open_mmap(self.path, writable=True)
+        writer.add_at(0, 1)
+        writer.flush()
+        self.assertEqual(expected[0] + 1, reader.element(0))
+
+    def test_fixed_length(self):
+        bit = Bit.create_mmap(self.path, 3, dtype='float64')
+        self.assertRaises(BITError, bit.init_with_list, self.lst)
+
+    def test_not_a_bit_file(self):
+        with open(self.path, 'wb') as fh:
+            fh.write(b'not a tree, just some bytes')
+        self.assertRaises(BITError, Bit.open_mmap, self.path)
+
+
+class TestRangeBit(TestCase):
+    def test_init_with_list_empty(self):
+        self.assertRaises(BITError, RangeBit(3).init_with_list, [])
+
+    def test_add_range_and_range_sum(self):
+        lst = [1, 5, 10, 100, -7, 3, 0, 2]
+        rbit = RangeBit(len(lst))
+        rbit.init_with_list(lst)
+        for i, j, delta in [(0, 7, 2), (2, 4, -3), (7, 7, 10), (0, 0, 1), (3, 6, 5)]:
+            rbit.add_range(i, j, delta)
+            for k in range(i, j + 1):
+                lst[k] += delta
+            self.assertEqual(lst, [rbit.element(k) for k in range(len(lst))])
+            self.assertEqual([[sum(lst[a:b + 1]) for b in range(a, len(lst))] for a in range(len(lst))],
+                             [[rbit.range_sum(a, b) for b in range(a, len(lst))] for a in range(len(lst))])
+
+    def test_add_range_invalid(self):
+        rbit = RangeBit(4)
+        self.assertRaises(BITError, rbit.add_range, 2, 1, 1)
+        self.assertRaises(BITError, rbit.add_range, 0, 4, 1)
+
+
+class TestBit2D(TestCase):
+    grid = [[1, 5, 10, 100, 3],
+            [-2, 0, 7, 1, 1],
+            [4, 4, 4, 4, 4],
+            [9, -1, 0, 2, 6]]
+
+    @staticmethod
+    def _rect_sum(grid, r1, c1, r2, c2):
+        return sum(sum(row[c1:c2 + 1]) for row in grid[r1:r2 + 1])
+
+    def _check_all_rect_sums(self, grid, bit2d):
+        rows, cols = len(grid), len(grid[0])
+        for r1 in range(rows):
+            for r2 in range(r1, rows):
+                for c1 in range(cols):
+                    for c2 in range(c1, cols):
+                        self.assertEqual(self._rect_sum(grid, r1, c1, r2, c2), bit2d.rect_sum(r1, c1, r2, c2))
+
+    def test_init_empty(self):
+        self.assertRaises(BITError, Bit2D, 0, 3)
+        self.assertRaises(BITError, Bit2D(2, 2).init_with_list, [])
+
+    def test_init_with_list_matches_add_at(self):
+        expected = Bit2D(len(self.grid), len(self.grid[0]))
+        for r, row in enumerate(self.grid):
+            for c, x in enumerate(row):
+                expected.add_at(r, c, x)
+        bit2d = Bit2D(1, 1)
+        bit2d.init_with_list(self.grid)
+        self.assertEqual(expected.tree_lst, bit2d.tree_lst)
+
+    def test_rect_sum_and_add_at(self):
+        grid = [row[:] for row in self.grid]
+        bit2d = Bit2D(len(grid), len(grid[0]))
+        bit2d.init_with_list(grid)
+        self._check_all_rect_sums(grid, bit2d)
+        for r, c, delta in [(0, 0, 5), (3, 4, -2), (1, 2, 10)]:
+            bit2d.add_at(r, c, delta)
+            grid[r][c] += delta
+        self._check_all_rect_sums(grid, bit2d)
+        self.assertEqual(grid, [[bit2d.element(r, c) for c in range(len(grid[0]))] for r in range(len(grid))])
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_init_with_numpy_array(self):
+        expected = Bit2D(1, 1)
+        expected.init_with_list(self.grid)
+        bit2d = Bit2D(1, 1, dtype='int64')
+        bit2d.init_with_list(np.array(self.grid))
+        self.assertEqual(expected.tree_lst, bit2d.tree_lst.tolist())
+        self._check_all_rect_sums(self.grid, bit2d)
+
+
+class TestSparseBit(TestCase):
+    updates = [(2 ** 63 + 5, 3), (17, 1), (0, 4), (2 ** 64 - 1, 2), (17, 5), (1 << 40, -7)]
+
+    def test_init_empty(self):
+        self.assertRaises(BITError, SparseBit, 0)
+
+    def test_prefix_and_range_sum(self):
+        sbit = SparseBit(2 ** 64)
+        for key, increment in self.updates:
+            sbit.add_at(key, increment)
+        for key in [0, 1, 16, 17, 18, 1 << 40, 2 ** 63, 2 ** 63 + 5, 2 ** 64 - 2, 2 ** 64 - 1]:
+            self.assertEqual(sum(x for k, x in self.updates if k <= key), sbit.prefix_sum(key))
+        self.assertEqual(6, sbit.element(17))
+        self.assertEqual(2, sbit.range_sum(1, 2 ** 63 + 5))
+        self.assertTrue(len(sbit.tree) <= len(self.updates) * 65)
+
+    def test_add_at_out_of_universe(self):
+        sbit = SparseBit(100)
+        self.assertRaises(BITError, sbit.add_at, 100, 1)
+        self.assertRaises(BITError, sbit.add_at, -1, 1)
+
+
+class TestCompressedBit(TestCase):
+    def test_init_empty(self):
+        self.assertRaises(BITError, CompressedBit, [])
+
+    def test_prefix_and_range_sum(self):
+        values = {10 ** 12: 5, 7: 1, 2 ** 62: 3, 99: -2}
+        cbit = CompressedBit(list(values) + [7, 500], values=values)
+        self.assertEqual(5, len(cbit.keys))
+        cbit.add_at(500, 10)
+        values[500] = 10
+        for key in [0, 7, 8, 99, 500, 501, 10 ** 12, 2 ** 62, 2 ** 63]:
+            self.assertEqual(sum(x for k, x in values.items() if k <= key), cbit.prefix_sum(key))
+        self.assertEqual(13, cbit.range_sum(8, 10 ** 12))
+        self.assertEqual(10, cbit.element(500))
+        self.assertRaises(BITError, cbit.add_at, 8, 1)
@@ -1,5 +1,8 @@
 from unittest import TestCase
 from exoticst.dijkstra_shortest_path import DijkstraSearch, make_undirected_weighted_graph
+from exoticst.heap_with_update import ArrayUpdatableHeap, UpdatableHeap
+from exoticst.pairing_heap import PairingHeap
+from exoticst.radix_heap import RadixHeap
 
 
 class TestDijkstraSearch(TestCase):
@@ -37,3 +40,37 @@ class TestDijkstraSearch(TestCase):
         dijkstra_search = DijkstraSearch(g)
         sorted_weights_str = dijkstra_search.str_of_sorted_shortest_paths(s)
         self.assertEqual(expected, sorted_weights_str)
+
+    def test_heap_classes(self):
+        edges = [[1, 2, 24], [1, 4, 20], [3, 1, 3], [4, 3, 12], [2, 5, 1], [5, 4, 2], [3, 5, 30]]
+        g = make_undirected_weighted_graph(edges)
+        expected = DijkstraSearch(g, heap_cls=UpdatableHeap).shortest_paths(1)
+        for heap_cls in (ArrayUpdatableHeap, PairingHeap, RadixHeap):
+            self.assertEqual(expected, DijkstraSearch(g, heap_cls=heap_cls).shortest_paths(1))
+
+    def test_heap_auto_selection(self):
+        g = make_undirected_weighted_graph([[1, 2, 24], [1, 4, 20], [3, 1, 3], [4, 3, 12]])
+        self.assertIsInstance(DijkstraSearch(g, heap_cls='auto').queue, RadixHeap)
+        g = make_undirected_weighted_graph([[1, 2, 24], [1, 4, 20.5], [3, 1, 3], [4, 3, 12]])
+        self.assertIsInstance(DijkstraSearch(g, heap_cls='auto').queue, UpdatableHeap)
+        self.assertEqual({1: 0, 2: 24, 3: 3, 4: 15}, DijkstraSearch(g, heap_cls='auto').shortest_paths(1)[1])
+        g = make_undirected_weighted_graph([[1, 2, 2 ** 40], [1, 4, 20], [3, 1, 3], [4, 3, 12]])
+        self.assertIsInstance(DijkstraSearch(g, heap_cls='auto').queue, UpdatableHeap)
+
+    def test_default_heap_for_int_weights(self):
+        g = make_undirected_weighted_graph([[1, 2, 24], [1, 4, 20], [3, 1, 3], [4, 3, 12]])
+        dijkstra_search = DijkstraSearch(g)
+        self.assertIsInstance(dijkstra_search.queue, UpdatableHeap)
+        dijkstra_search.init_q(1)  # float('inf') is a valid heap key of the default heap
+        self.assertEqual((0, 1, None), tuple(dijkstra_search.queue.pop()))
+        self.assertEqual(3, len(dijkstra_search.queue))
+
+    def test_default_tie_order(self):
+        """
+        The vertices at equal distances are settled in the order of their labels by the default heap
+        """
+        edges = [[0, v, 1] for v in (5, 3, 4, 1, 2)] + [[v, 6, 1] for v in (5, 3)]
+        g = make_undirected_weighted_graph(edges)
+        path, dict_of_weights = DijkstraSearch(g).shortest_paths(0)
+        self.assertEqual([0, 1, 2, 3, 4, 5, 6], path)
+        self.assertEqual({0: 0, 1: 1, 2: 1, 3: 1, 4: 1, 5: 1, 6: 2}, dict_of_weights)
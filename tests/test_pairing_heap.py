@@ -0,0 +1,51 @@
+from random import Random
+from unittest import TestCase
+from exoticst.pairing_heap import PairingHeap
+
+
+class TestPairingHeap(TestCase):
+    l2 = [
+        (5, 5, 5), (1, 1, 1), (3, 3, 3), (0, 0, 0), (10, 10, 10), (11, 11, 11), (9, 9, 9), (8, 8, 8), (7, 7, 7),
+        (2, 2, 2), (6, 6, 6)
+    ]
+
+    def test_push_pop(self):
+        heapq = PairingHeap()
+        for el in self.l2:
+            heapq.push(*el)
+        self.assertEqual(len(self.l2), len(heapq))
+        self.assertEqual(sorted(self.l2), [tuple(heapq.pop()) for _ in range(len(self.l2))])
+        self.assertEqual(0, len(heapq))
+        self.assertRaises(IndexError, heapq.pop)
+
+    def test_decrease_and_update(self):
+        heapq = PairingHeap()
+        for el in self.l2:
+            heapq.push(*el)
+        heapq.decrease(-1, 11, 11)
+        heapq.decrease(-2, 0, 0)
+        heapq.decrease(4, 12, 12)
+        heapq.update(20, 3, 3)
+        heapq.update(-3, 9, 9)
+        heapq.update(21, 9, 9)
+        expected = sorted([(-1, 11, 11), (-2, 0, 0), (4, 12, 12), (20, 3, 3), (21, 9, 9)] +
+                          [x for x in self.l2 if x[1] not in (11, 0, 3, 9)])
+        self.assertEqual(expected, [tuple(heapq.pop()) for _ in range(len(heapq))])
+
+    def test_random_against_dict(self):
+        rnd = Random(9)
+        heapq = PairingHeap()
+        current = {}
+        for step in range(2000):
+            key = rnd.randrange(100)
+            if key in current:
+                current[key] = rnd.randrange(1000)
+                heapq.update(current[key], key, None)
+            else:
+                current[key] = rnd.randrange(1000)
+                heapq.decrease(current[key], key, None)
+            if step % 3 == 0:
+                el = heapq.pop()
+                self.assertEqual(min(current.values()), el.heap_key)
+                self.assertEqual(current.pop(el.key), el.heap_key)
+            self.assertEqual(len(current), len(heapq))
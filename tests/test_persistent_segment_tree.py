@@ -0,0 +1,66 @@
+import operator
+from random import Random
+from unittest import TestCase
+from exoticst.persistent_segment_tree import PersistentSegmentTree
+
+
+def count_nodes(roots):
+    seen, stack = set(), list(roots)
+    while stack:
+        node = stack.pop()
+        if node is not None and id(node) not in seen:
+            seen.add(id(node))
+            stack.extend(node[1:])
+    return len(seen)
+
+
+class TestPersistentSegmentTree(TestCase):
+    a = [5, 3, 7, 4, 8, 1, 9, 2, 6]
+
+    def _check_all_queries(self, a, t, version, f):
+        for j in range(len(a)):
+            for i in range(j + 1):
+                self.assertEqual(f(a[i:j + 1]), t.rmq(version, i, j))
+
+    def test_versions(self):
+        rnd = Random(3)
+        for op, identity, f in ((min, float('inf'), min), (max, -float('inf'), max), (operator.add, 0, sum),
+                                (sum, 0, sum)):
+            t = PersistentSegmentTree(self.a, op=op, identity=identity)
+            history = {0: self.a[:]}
+            for _ in range(20):
+                base = rnd.choice(list(history))
+                j, x = rnd.randrange(len(self.a)), rnd.randrange(-10, 10)
+                v = t.set_value(j, x, version=base)
+                history[v] = history[base][:]
+                history[v][j] = x
+            for v, a in history.items():
+                self._check_all_queries(a, t, v, f)
+                self.assertEqual(a, [t.element(k, v) for k in range(len(a))])
+
+    def test_update_shares_nodes(self):
+        t = PersistentSegmentTree(self.a, op=operator.add, identity=0)
+        n_nodes = count_nodes(t.roots.values())
+        v = t.update(4, 10)
+        self.assertEqual(sum(self.a) + 10, t.rmq(v, 0, len(self.a) - 1))
+        self.assertEqual(sum(self.a), t.rmq(0, 0, len(self.a) - 1))
+        self.assertTrue(count_nodes(t.roots.values()) - n_nodes <= len(self.a).bit_length() + 1)
+
+    def test_drop(self):
+        t = PersistentSegmentTree(self.a)
+        v1 = t.set_value(0, 0)
+        v2 = t.set_value(1, 0)
+        v3 = t.set_value(2, 0)
+        t.drop(v1)
+        self.assertEqual([0, v2, v3], t.versions())
+        t.drop_before(v3)
+        self.assertEqual([v3], t.versions())
+        self.assertRaises(KeyError, t.rmq, v2, 0, 1)
+        self.assertRaises(KeyError, t.drop, v3)
+        self.assertEqual(count_nodes([t.roots[v3]]), count_nodes(t.roots.values()))
+
+    def test_invalid_arguments(self):
+        t = PersistentSegmentTree(self.a)
+        self.assertRaises(RuntimeError, t.rmq, 0, 3, 2)
+        self.assertRaises(IndexError, t.set_value, len(self.a), 0)
+        self.assertRaises(RuntimeError, PersistentSegmentTree([]).rmq, 0, 0, 0)
@@ -0,0 +1,52 @@
+from random import Random
+from unittest import TestCase
+from exoticst.radix_heap import RadixHeap
+
+
+class TestRadixHeap(TestCase):
+    l2 = [
+        (5, 5, 5), (1, 1, 1), (3, 3, 3), (0, 0, 0), (10, 10, 10), (11, 11, 11), (9, 9, 9), (8, 8, 8), (7, 7, 7),
+        (2, 2, 2), (6, 6, 6)
+    ]
+
+    def test_push_pop(self):
+        heapq = RadixHeap()
+        for el in self.l2:
+            heapq.push(*el)
+        self.assertEqual(len(self.l2), len(heapq))
+        self.assertEqual(sorted(self.l2), [tuple(heapq.pop()) for _ in range(len(self.l2))])
+        self.assertEqual(0, len(heapq))
+        self.assertRaises(IndexError, heapq.pop)
+
+    def test_decrease_and_update(self):
+        heapq = RadixHeap()
+        for el in self.l2:
+            heapq.push(*el)
+        self.assertEqual((0, 0, 0), tuple(heapq.pop()))
+        heapq.decrease(1, 11, 11)
+        heapq.decrease(4, 12, 12)
+        heapq.update(20, 3, 3)
+        heapq.update(2, 9, 9)
+        self.assertRaises(ValueError, heapq.decrease, -1, 5, 5)
+        self.assertRaises(ValueError, heapq.push, -1, 13, 13)
+        expected = sorted([(1, 11, 11), (4, 12, 12), (20, 3, 3), (2, 9, 9)] +
+                          [x for x in self.l2 if x[1] not in (11, 0, 3, 9)])
+        self.assertEqual([x[0] for x in expected], [heapq.pop().heap_key for _ in range(len(heapq))])
+
+    def test_random_monotone(self):
+        rnd = Random(5)
+        heapq = RadixHeap()
+        current = {}
+        last = 0
+        for step in range(3000):
+            key = rnd.randrange(200)
+            new_heap_key = last + rnd.randrange(1000)
+            if key not in current or new_heap_key < current[key]:
+                current[key] = new_heap_key
+                heapq.decrease(new_heap_key, key, None)
+            if step % 3 == 0:
+                el = heapq.pop()
+                self.assertEqual(min(current.values()), el.heap_key)
+                self.assertEqual(current.pop(el.key), el.heap_key)
+                last = el.heap_key
+            self.assertEqual(len(current), len(heapq))
@@ -0,0 +1,57 @@
+from unittest import TestCase, skipIf
+from exoticst.sparse_table import SparseTable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def stupid_arg_query(a, i, j, f=min):
+    value = f(a[i:j + 1])
+    return a.index(value, i)
+
+
+class TestSparseTable(TestCase):
+    a = [5, 3, 7, 3, 8, 1, 9, 1, 6, 9, 2]
+
+    def _check_all_queries(self, a, st, f):
+        for j in range(len(a)):
+            for i in range(j + 1):
+                self.assertEqual(f(a[i:j + 1]), st.query(i, j))
+                self.assertEqual(stupid_arg_query(a, i, j, f), st.arg_query(i, j))
+
+    def test_min_and_max(self):
+        for n in range(1, len(self.a) + 1):
+            a = self.a[:n]
+            self._check_all_queries(a, SparseTable(a), min)
+            self._check_all_queries(a, SparseTable(a, f=max), max)
+
+    def test_invalid_arguments(self):
+        st = SparseTable(self.a)
+        self.assertRaises(RuntimeError, st.query, 3, 2)
+        self.assertRaises(RuntimeError, st.query, 0, len(self.a))
+        self.assertRaises(RuntimeError, SparseTable([]).query, 0, 0)
+        self.assertRaises(ValueError, SparseTable, self.a, f=sum)
+
+    def test_query_many(self):
+        st = SparseTable(self.a, f=max)
+        self.assertEqual([9, 3, 9], st.query_many([0, 1, 5], [10, 1, 6]))
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_numpy_storage(self):
+        for n in range(1, len(self.a) + 1):
+            a = self.a[:n]
+            self._check_all_queries(a, SparseTable(a, dtype='int64'), min)
+            self._check_all_queries(a, SparseTable(a, f=max, dtype='float64'), max)
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_numpy_query_many(self):
+        for f in (min, max):
+            st = SparseTable(self.a, f=f, dtype='int64')
+            starts, ends = zip(*[(i, j) for j in range(len(self.a)) for i in range(j + 1)])
+            self.assertEqual([stupid_arg_query(self.a, i, j, f) for i, j in zip(starts, ends)],
+                             st.arg_query_many(starts, ends).tolist())
+            self.assertEqual([f(self.a[i:j + 1]) for i, j in zip(starts, ends)],
+                             st.query_many(np.array(starts), np.array(ends)).tolist())
+        self.assertRaises(RuntimeError, st.query_many, [2], [1])
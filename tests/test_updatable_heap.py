@@ -1,5 +1,6 @@
+from random import Random
 from unittest import TestCase
-from exoticst.heap_with_update import UpdatableHeap
+from exoticst.heap_with_update import ArrayUpdatableHeap, UpdatableHeap
 
 
 class TestUpdatableHeap(TestCase):
@@ -68,3 +69,188 @@ class TestUpdatableHeap(TestCase):
         heapq.update(*(20, 3, 3))
         realised = [(x.heap_key, x.key, x.data) for x in heapq.sorted_iterator()]
         self.assertEqual(expected, realised)
+
+    def test_arity(self):
+        l2 = [(x * 37 % 101, x, x) for x in range(60)]
+        for arity in (2, 3, 4, 8):
+            heapq = UpdatableHeap(arity=arity)
+            for x in l2:
+                heapq.push(*x)
+            for key in range(3, 60, 3):
+                heapq.decrease(-key, key, key)
+            expected = sorted((-x[1], x[1], x[2]) if x[1] % 3 == 0 and x[1] else x for x in l2)
+            self.assertEqual(expected, [tuple(x) for x in heapq.sorted_iterator()])
+        self.assertRaises(ValueError, UpdatableHeap, arity=1)
+
+    def test_sorted_iterator_restores_register(self):
+        l2 = [(x * 37 % 101, x, x) for x in range(30)]
+        heapq = UpdatableHeap()
+        for x in l2:
+            heapq.push(*x)
+        list(heapq.sorted_iterator())
+        self.assertEqual({el.key: j for j, el in enumerate(heapq.heap)}, heapq.register)
+        heapq.decrease(-1, 29, 29)
+        self.assertEqual((-1, 29, 29), heapq.pop())
+
+    def test_from_items(self):
+        l2 = [(x * 37 % 101, x, x) for x in range(50)]
+        for arity in (2, 3, 4):
+            heapq = UpdatableHeap.from_items(iter(l2), arity=arity)
+            self.assertEqual({el.key: j for j, el in enumerate(heapq.heap)}, heapq.register)
+            self.assertEqual(sorted(l2), [tuple(heapq.pop()) for _ in range(len(l2))])
+        self.assertEqual(0, len(UpdatableHeap.from_items([])))
+        self.assertRaises(ValueError, UpdatableHeap.from_items, [(1, 1, 1), (2, 1, 2)])
+
+    def test_iter_smallest(self):
+        l2 = [(x * 37 % 101, x, x) for x in range(50)]
+        for arity in (2, 4):
+            heapq = UpdatableHeap.from_items(l2, arity=arity)
+            heap_store, register_store = heapq.heap[:], dict(heapq.register)
+            for k in (0, 1, 7, 50, 60):
+                self.assertEqual(sorted(l2)[:k], [tuple(x) for x in heapq.iter_smallest(k)])
+            self.assertEqual(heap_store, heapq.heap)
+            self.assertEqual(register_store, heapq.register)
+
+    def test_update_increase(self):
+        heapq = UpdatableHeap.from_items([(x, x, None) for x in range(20)])
+        heapq.update(30, 0, None)
+        heapq.update(25, 7, None)
+        heapq.update(-1, 19, None)
+        expected = sorted([(x, x, None) for x in range(1, 19) if x != 7] + [(30, 0, None), (25, 7, None),
+                                                                         (-1, 19, None)])
+        self.assertEqual(expected, [tuple(heapq.pop()) for _ in range(len(heapq))])
+
+    def test_remove_contains_peek(self):
+        rnd = Random(3)
+        l2 = [(rnd.randrange(100), x, x) for x in range(60)]
+        heapq = UpdatableHeap.from_items(l2, arity=3)
+        self.assertEqual(min(l2), heapq.peek())
+        removed = [x for x in l2 if x[1] % 4 == 1]
+        for x in removed:
+            self.assertTrue(x[1] in heapq)
+            self.assertEqual(x, tuple(heapq.remove(x[1])))
+            self.assertFalse(x[1] in heapq)
+        self.assertRaises(KeyError, heapq.remove, 1)
+        self.assertEqual(sorted(set(l2) - set(removed)), [tuple(heapq.pop()) for _ in range(len(heapq))])
+        self.assertRaises(IndexError, heapq.peek)
+
+    def test_maxlen_top_k(self):
+        rnd = Random(4)
+        l2 = [(rnd.randrange(1000), x, None) for x in range(200)]
+        heapq = UpdatableHeap(maxlen=10)
+        evicted = []
+        for x in l2:
+            el = heapq.push(*x)
+            if el is not None:
+                evicted.append(tuple(el))
+        self.assertEqual(10, len(heapq))
+        self.assertEqual(sorted(l2)[:-10], sorted(evicted))
+        self.assertEqual(sorted(l2)[-10:], [tuple(x) for x in heapq.sorted_iterator()])
+        top = sorted(l2)[-1]
+        heapq.update(-1, top[1], None)  # the best element becomes the worst one
+        self.assertEqual((-1, top[1], None), tuple(heapq.peek()))
+        self.assertRaises(ValueError, UpdatableHeap, maxlen=0)
+
+    def test_decrease_root(self):
+        for capacity in (None, 3):
+            heapq = UpdatableHeap(capacity=capacity)
+            heapq.push(1, 0, None)
+            heapq.push(2, 1, None)
+            heapq.decrease(0, 0, None)  # the key 0 is at the root, it must not be pushed again
+            self.assertEqual(2, len(heapq))
+            self.assertEqual([(0, 0, None), (2, 1, None)], [tuple(heapq.pop()) for _ in range(2)])
+
+    def test_capacity(self):
+        rnd = Random(6)
+        n = 50
+        heaps = [UpdatableHeap(arity=3), UpdatableHeap(arity=3, capacity=n)]
+        for step in range(2000):
+            key = rnd.randrange(n)
+            op = rnd.randrange(4)
+            if key not in heaps[0]:
+                args = (rnd.randrange(1000), key, None)
+                for heapq in heaps:
+                    heapq.decrease(*args)
+            elif op == 0:
+                args = (rnd.randrange(1000), key, None)
+                for heapq in heaps:
+                    heapq.update(*args)
+            elif op == 1:
+                self.assertEqual(heaps[0].remove(key), heaps[1].remove(key))
+            elif len(heaps[0]):
+                self.assertEqual(heaps[0].pop(), heaps[1].pop())
+            self.assertEqual(heaps[0].heap, heaps[1].heap)
+            self.assertEqual([heaps[0].register.get(k) for k in range(n)], heaps[1].register)
+            self.assertEqual(key in heaps[0], key in heaps[1])
+        heapq = heaps[1]
+        self.assertRaises(IndexError, heapq.push, 1, n, None)
+        self.assertRaises(IndexError, heapq.push, 1, -1, None)
+        self.assertRaises(KeyError, heapq.remove, next(k for k in range(n) if k not in heapq))
+        self.assertFalse(-1 in heapq or n in heapq)
+        l2 = [(x * 37 % 101, x, x) for x in range(n)]
+        heapq = UpdatableHeap.from_items(l2, capacity=n)
+        self.assertEqual(sorted(l2), [tuple(x) for x in heapq.sorted_iterator()])
+        self.assertEqual(sorted(l2), heapq.heapsort([]))
+        self.assertRaises(ValueError, UpdatableHeap.from_items, [(1, 1, None), (2, 1, None)], capacity=n)
+
+
+class TestArrayUpdatableHeap(TestCase):
+    l2 = [
+        (5, 5, 5), (1, 1, 1), (3, 3, 3), (0, 0, 0), (10, 10, 10), (11, 11, 11), (9, 9, 9), (8, 8, 8), (7, 7, 7),
+        (2, 2, 2), (6, 6, 6)
+    ]
+
+    def test_heapsort(self):
+        self.assertEqual(sorted(self.l2), ArrayUpdatableHeap().heapsort(self.l2))
+        self.assertEqual([], ArrayUpdatableHeap().heapsort([]))
+
+    def test_sorted_iterator_restores_heap(self):
+        heapq = ArrayUpdatableHeap()
+        for el in self.l2:
+            heapq.push(*el)
+        self.assertEqual(sorted(self.l2), list(heapq.sorted_iterator()))
+        self.assertEqual(len(self.l2), len(heapq))
+        heapq.decrease(-1, 11, 11)
+        self.assertEqual((-1, 11, 11), heapq.pop())
+
+    def test_update_both_directions(self):
+        heapq = ArrayUpdatableHeap()
+        for el in self.l2:
+            heapq.push(*el)
+        heapq.update(20, 3, 3)
+        heapq.update(-5, 9, 9)
+        heapq.update(12, 0, 0)
+        expected = sorted([(20, 3, 3) if x[1] == 3 else (-5, 9, 9) if x[1] == 9 else (12, 0, 0) if x[1] == 0 else x
+                           for x in self.l2])
+        self.assertEqual(expected, [tuple(heapq.pop()) for _ in range(len(heapq))])
+
+    def test_decrease_root(self):
+        heapq = ArrayUpdatableHeap()
+        heapq.push(1, 'a', None)
+        heapq.push(2, 'b', None)
+        heapq.decrease(0, 'a', None)
+        self.assertEqual(2, len(heapq))
+
+    def test_ties_are_fifo(self):
+        heapq = ArrayUpdatableHeap()
+        for key in 'edcba':
+            heapq.push(1, key, None)
+        self.assertEqual(list('edcba'), [heapq.pop().key for _ in range(5)])
+
+    def test_random_against_sorted(self):
+        rnd = Random(4)
+        heapq = ArrayUpdatableHeap()
+        current = {}
+        for step in range(500):
+            key = rnd.randrange(50)
+            if key in current and rnd.random() < 0.5:
+                current[key] = rnd.randrange(100)
+                heapq.update(current[key], key, None)
+            elif key not in current:
+                current[key] = rnd.randrange(100)
+                heapq.push(current[key], key, None)
+            if step % 7 == 0 and current:
+                el = heapq.pop()
+                self.assertEqual(min(current.values()), el.heap_key)
+                self.assertEqual(current.pop(el.key), el.heap_key)
+        self.assertEqual(sorted(current.values()), [heapq.pop().heap_key for _ in range(len(heapq))])
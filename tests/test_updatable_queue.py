@@ -0,0 +1,118 @@
+import asyncio
+import threading
+from queue import Empty, Full
+from random import Random
+from unittest import TestCase
+from exoticst.updatable_queue import AsyncUpdatablePriorityQueue, UpdatablePriorityQueue
+
+
+class TestUpdatablePriorityQueue(TestCase):
+    def test_put_get_reprioritise(self):
+        q = UpdatablePriorityQueue()
+        q.put_many([(5, 'a', None), (3, 'b', None), (4, 'c', None), (1, 'd', None)])
+        q.reprioritise(0, 'a')
+        q.reprioritise(10, 'd')
+        q.put(2, 'c')  # an existing key is reprioritised
+        self.assertTrue('b' in q)
+        self.assertEqual(3, q.remove('b').heap_key)
+        self.assertFalse('b' in q)
+        self.assertEqual('a', q.peek().key)
+        self.assertEqual(['a', 'c'], [el.key for el in q.get_many(2)])
+        self.assertEqual('d', q.get().key)
+        self.assertTrue(q.empty())
+        self.assertRaises(Empty, q.get, block=False)
+        self.assertRaises(Empty, q.get, timeout=0.01)
+        self.assertRaises(Empty, q.peek)
+
+    def test_bounded(self):
+        q = UpdatablePriorityQueue(maxsize=2)
+        q.put(1, 'a')
+        q.put(2, 'b')
+        self.assertTrue(q.full())
+        self.assertRaises(Full, q.put, 3, 'c', block=False)
+        self.assertRaises(Full, q.put, 3, 'c', timeout=0.01)
+        q.put(0, 'b', block=False)  # reprioritisation does not need a free slot
+        self.assertRaises(Full, q.put_many, [(3, 'c', None)], timeout=0.01)
+        consumer = threading.Timer(0.05, q.get)
+        consumer.start()
+        q.put(3, 'c', timeout=5)
+        consumer.join()
+        self.assertEqual(['a', 'c'], [el.key for el in q.get_many(5)])
+
+    def test_producers_consumers(self):
+        q = UpdatablePriorityQueue(maxsize=16)
+        n_producers, n_items = 4, 500
+        consumed = []
+        lock = threading.Lock()
+
+        def produce(p):
+            rnd = Random(p)
+            for i in range(n_items):
+                q.put(rnd.randrange(1000), (p, i))
+
+        def consume():
+            while True:
+                items = q.get_many(8)
+                if any(el.key is None for el in items):
+                    q.put(float('inf'), None)  # let the other consumers stop too
+                    items = [el for el in items if el.key is not None]
+                    with lock:
+                        consumed.extend(items)
+                    return
+                with lock:
+                    consumed.extend(items)
+
+        producers = [threading.Thread(target=produce, args=(p,)) for p in range(n_producers)]
+        consumers = [threading.Thread(target=consume) for _ in range(3)]
+        for t in producers + consumers:
+            t.start()
+        for t in producers:
+            t.join()
+        q.put(float('inf'), None)
+        for t in consumers:
+            t.join()
+        self.assertEqual(sorted((p, i) for p in range(n_producers) for i in range(n_items)),
+                         sorted(el.key for el in consumed))
+
+
+def _run(coroutine):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+class TestAsyncUpdatablePriorityQueue(TestCase):
+    def test_put_get_reprioritise(self):
+        async def main():
+            q = AsyncUpdatablePriorityQueue()
+            await q.put_many([(5, 'a', None), (3, 'b', None), (4, 'c', None)])
+            q.reprioritise(0, 'a')
+            q.put_nowait(10, 'b')
+            self.assertEqual(4, q.remove('c').heap_key)
+            self.assertEqual(['a', 'b'], [el.key for el in await q.get_many(5)])
+            self.assertRaises(asyncio.QueueEmpty, q.get_nowait)
+            self.assertRaises(asyncio.QueueEmpty, q.peek)
+
+        _run(main())
+
+    def test_getters_wake_on_put(self):
+        async def main():
+            q = AsyncUpdatablePriorityQueue(maxsize=1)
+            getters = [asyncio.ensure_future(q.get()) for _ in range(3)]
+            await asyncio.sleep(0)
+            self.assertFalse(any(g.done() for g in getters))
+            for key in 'xyz':
+                await q.put(1, key)  # waits for a free slot until a getter takes the previous item
+            results = await asyncio.wait_for(asyncio.gather(*getters), 1)
+            self.assertEqual(['x', 'y', 'z'], [el.key for el in results])
+            q.put_nowait(1, 'a')
+            self.assertRaises(asyncio.QueueFull, q.put_nowait, 2, 'b')
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(q.put(2, 'b'), 0.01)
+            self.assertEqual('a', (await q.get()).key)
+
+        _run(main())
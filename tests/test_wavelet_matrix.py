@@ -0,0 +1,54 @@
+from random import Random
+from unittest import TestCase, skipIf
+from exoticst.wavelet_matrix import WaveletMatrix
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestWaveletMatrix(TestCase):
+    a = [5, 3, 7, 3, 8, 1, 9, 1, 6, 9, 2]
+
+    def _check_all_queries(self, a, wm):
+        for j in range(len(a)):
+            for i in range(j + 1):
+                srt = sorted(a[i:j + 1])
+                self.assertEqual(srt, [wm.kth_smallest(i, j, k) for k in range(1, j - i + 2)])
+                for x in range(min(a) - 1, max(a) + 2):
+                    self.assertEqual(sum(1 for y in srt if y < x), wm.count_less(i, j, x))
+
+    def test_queries(self):
+        for n in range(1, len(self.a) + 1):
+            self._check_all_queries(self.a[:n], WaveletMatrix(self.a[:n]))
+
+    def test_large_random(self):
+        rnd = Random(1)
+        a = [rnd.randrange(-1000, 1000) for _ in range(300)]
+        wm = WaveletMatrix(a)
+        for _ in range(200):
+            i = rnd.randrange(len(a))
+            j = rnd.randrange(i, len(a))
+            srt = sorted(a[i:j + 1])
+            k = rnd.randrange(1, j - i + 2)
+            self.assertEqual(srt[k - 1], wm.kth_smallest(i, j, k))
+            x = rnd.randrange(-1100, 1100)
+            self.assertEqual(sum(1 for y in srt if y < x), wm.count_less(i, j, x))
+
+    def test_invalid_arguments(self):
+        wm = WaveletMatrix(self.a)
+        self.assertRaises(RuntimeError, wm.kth_smallest, 3, 2, 1)
+        self.assertRaises(RuntimeError, wm.kth_smallest, 0, 2, 4)
+        self.assertRaises(RuntimeError, wm.count_less, 0, len(self.a), 1)
+        self.assertRaises(RuntimeError, WaveletMatrix([]).count_less, 0, 0, 1)
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_numpy_build(self):
+        rnd = Random(2)
+        a = [rnd.randrange(0, 50) for _ in range(200)]
+        wm, np_wm = WaveletMatrix(a), WaveletMatrix(a, dtype='int64')
+        self.assertEqual(wm.words, np_wm.words)
+        self.assertEqual(wm.ranks, np_wm.ranks)
+        self.assertEqual(wm.zeros, np_wm.zeros)
+        self._check_all_queries(self.a, WaveletMatrix(self.a, dtype='int32'))